@@ -9,20 +9,62 @@ The EDRM XML format stores emails and attachments with:
 """
 
 import argparse
+import errno
 import hashlib
 import json
+import mmap
 import os
 import re
+import struct
 import sys
-import xml.etree.ElementTree as ET
+import tempfile
+import threading
 import zipfile
-from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass, field, asdict
+import zlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+from typing import Dict, List, Optional, Set, Tuple, Any
+from dataclasses import dataclass, field
 from datetime import datetime
 
+try:
+    from lxml import etree as ET
+    HAVE_LXML = True
+except ImportError:  # pragma: no cover - fall back to the stdlib parser
+    import xml.etree.ElementTree as ET
+    HAVE_LXML = False
 
-@dataclass
+try:
+    import orjson
+except ImportError:  # pragma: no cover - fall back to the stdlib encoder
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - only needed for --format msgpack
+    msgpack = None
+
+# Chunk size used when streaming attachment payloads out of the ZIP
+COPY_BUFSIZE = 1024 * 1024
+
+# Result files (without extension), written one record at a time as
+# newline-delimited JSON (.jsonl) or a stream of msgpack objects (.msgpack)
+EMAILS_FILE = "edrm_emails"
+ATTACHMENTS_FILE = "edrm_attachments"
+OUTPUT_FORMATS = ("jsonl", "msgpack")
+
+# Fixed part of a ZIP local file header (signature ... name length, extra length)
+_LOCAL_HEADER = struct.Struct("<4s22xHH")
+
+# A filename suffix that is a file extension (".pdf", ".xls", ".mp3") rather
+# than the tail of a dotted doc_id such as "3.1.A0001.1"
+_FILE_EXTENSION_RE = re.compile(r"\.(?=[0-9]*[a-z])[a-z0-9]{1,5}")
+
+# copy_file_range errors that mean "not supported here" rather than a failed copy
+_NO_COPY_RANGE_ERRNOS = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP}
+
+
+@dataclass(slots=True)
 class Attachment:
     """Represents an extracted attachment."""
     doc_id: str
@@ -36,7 +78,7 @@ class Attachment:
     parent_doc_id: str = ""  # The email this belongs to
 
 
-@dataclass
+@dataclass(slots=True)
 class Email:
     """Represents an email from EDRM data."""
     doc_id: str
@@ -54,6 +96,13 @@ class Email:
     md5_hash: str
 
 
+@dataclass(slots=True)
+class RawZip:
+    """Direct access to an open ZIP file's bytes, alongside its ZipFile."""
+    fd: int
+    view: memoryview  # The whole file, memory-mapped
+
+
 class EDRMExtractor:
     """Extract attachments from EDRM XML format."""
 
@@ -61,12 +110,21 @@ class EDRMExtractor:
         self,
         output_dir: str,
         max_attachment_size: int = 50 * 1024 * 1024,  # 50MB default
-        verbose: bool = False
+        verbose: bool = False,
+        threads: Optional[int] = None,
+        output_format: str = "jsonl",
+        attachments_dir: Optional[str] = None
     ):
         self.output_dir = Path(output_dir)
-        self.attachments_dir = self.output_dir / "attachments"
+        # Content-addressed store; may be shared by several output directories
+        self.attachments_dir = Path(attachments_dir) if attachments_dir else self.output_dir / "attachments"
         self.max_attachment_size = max_attachment_size
         self.verbose = verbose
+        self.threads = threads or os.cpu_count() or 1
+        self.output_format = output_format
+
+        # Guards stats while attachments are extracted in parallel
+        self._lock = threading.Lock()
 
         # Statistics
         self.stats = {
@@ -81,39 +139,49 @@ class EDRMExtractor:
             "errors": 0,
         }
 
-        # Hash cache for deduplication
-        self.hash_cache: Dict[str, str] = {}  # sha256 -> storage_path
+        # Shard directories (first 4 hex chars) already created on disk
+        self._created_shards: Set[str] = set()
 
-        # Results
-        self.emails: List[Email] = []
-        self.attachments: List[Attachment] = []
+        # Results are streamed to NDJSON files as each ZIP completes;
+        # only the counts are kept in memory
+        self.emails_saved = 0
+        self.attachments_saved = 0
+        self._emails_fp = None
+        self._attachments_fp = None
 
         # Create output directories
+        self.output_dir.mkdir(parents=True, exist_ok=True)
         self.attachments_dir.mkdir(parents=True, exist_ok=True)
 
+    def _count(self, key: str, amount: int = 1) -> None:
+        """Increment a statistics counter (safe to call from worker threads)."""
+        with self._lock:
+            self.stats[key] += amount
+
     def _get_storage_path(self, sha256_hash: str, extension: str) -> str:
         """Get sharded storage path for attachment."""
         # Two-level sharding: ab/cd/abcdef...ext
         shard1 = sha256_hash[:2]
         shard2 = sha256_hash[2:4]
         shard_dir = self.attachments_dir / shard1 / shard2
-        shard_dir.mkdir(parents=True, exist_ok=True)
+        if sha256_hash[:4] not in self._created_shards:
+            shard_dir.mkdir(parents=True, exist_ok=True)
+            self._created_shards.add(sha256_hash[:4])
         return str(shard_dir / f"{sha256_hash}{extension}")
 
-    def _compute_sha256(self, data: bytes) -> str:
-        """Compute SHA256 hash of data."""
-        return hashlib.sha256(data).hexdigest()
-
-    def _parse_tag_value(self, doc: ET.Element, tag_name: str) -> str:
-        """Extract a tag value from a document element."""
-        for tag in doc.findall(".//Tag"):
-            if tag.get("TagName") == tag_name:
-                return tag.get("TagValue", "")
-        return ""
+    def _tag_map(self, doc: Any) -> Dict[str, str]:
+        """Index a document's tags by name (TagName -> TagValue) in a single pass."""
+        tags = {}
+        for tag in doc.iterfind("Tags/Tag"):
+            # Keep the first occurrence, matching the previous first-match lookup
+            tags.setdefault(tag.get("TagName"), tag.get("TagValue", ""))
+        return tags
 
-    def _parse_file_info(self, doc: ET.Element) -> Tuple[str, str, int, str]:
+    def _parse_file_info(self, doc: Any) -> Tuple[str, str, int, str]:
         """Extract native file info (path, filename, size, hash)."""
-        for file_elem in doc.findall(".//File[@FileType='Native']"):
+        # EDRM v2 nests these as Document/Files/File; direct child paths avoid
+        # walking the whole Document subtree
+        for file_elem in doc.iterfind("Files/File[@FileType='Native']"):
             ext_file = file_elem.find("ExternalFile")
             if ext_file is not None:
                 return (
@@ -124,178 +192,385 @@ class EDRMExtractor:
                 )
         return "", "", 0, ""
 
-    def _parse_xml(self, xml_content: str) -> Tuple[List[Email], Dict[str, Attachment]]:
-        """Parse EDRM XML content and extract emails and attachments."""
+    def _iter_documents(self, xml_stream):
+        """
+        Stream Document elements from an EDRM XML file.
+
+        Each Document is cleared once the caller is done with it, so memory
+        stays bounded regardless of the size of the XML file.
+        """
+        if HAVE_LXML:
+            context = ET.iterparse(xml_stream, events=("end",), tag="Document", recover=True, huge_tree=True)
+        else:
+            context = ET.iterparse(xml_stream, events=("end",))
+
+        for _, elem in context:
+            if elem.tag != "Document":
+                continue
+            yield elem
+            elem.clear()
+            if HAVE_LXML:
+                # Drop already-processed siblings so the root doesn't keep them alive
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+
+    def _parse_xml(self, xml_stream) -> Tuple[List[Email], Dict[str, Attachment]]:
+        """Parse an EDRM XML stream and extract emails and attachments."""
         emails = []
         attachments = {}  # doc_id -> Attachment
 
         try:
-            root = ET.fromstring(xml_content)
+            for doc in self._iter_documents(xml_stream):
+                self._parse_document(doc, emails, attachments)
         except ET.ParseError as e:
             print(f"  XML parse error: {e}", file=sys.stderr)
-            return emails, attachments
-
-        for doc in root.findall(".//Document"):
-            doc_id = doc.get("DocID", "")
-            doc_type = doc.get("DocType", "")
-            mime_type = doc.get("MimeType", "")
-
-            if doc_type == "Message":
-                # This is an email
-                has_att = self._parse_tag_value(doc, "#HasAttachments").lower() == "true"
-                att_count = int(self._parse_tag_value(doc, "#AttachmentCount") or "0")
-                att_names_str = self._parse_tag_value(doc, "#AttachmentNames")
-                att_names = [n.strip() for n in att_names_str.split(";")] if att_names_str else []
-
-                # Get location info
-                location = doc.find(".//Location")
-                custodian = ""
-                folder = ""
-                if location is not None:
-                    cust_elem = location.find("Custodian")
-                    folder_elem = location.find("LocationURI")
-                    custodian = cust_elem.text if cust_elem is not None else ""
-                    folder = folder_elem.text if folder_elem is not None else ""
-
-                # Get native file info
-                file_path, file_name, file_size, md5_hash = self._parse_file_info(doc)
-
-                email = Email(
-                    doc_id=doc_id,
-                    from_addr=self._parse_tag_value(doc, "#From"),
-                    to_addrs=self._parse_tag_value(doc, "#To"),
-                    cc_addrs=self._parse_tag_value(doc, "#CC"),
-                    subject=self._parse_tag_value(doc, "#Subject"),
-                    date_sent=self._parse_tag_value(doc, "#DateSent"),
-                    has_attachments=has_att,
-                    attachment_count=att_count,
-                    attachment_names=att_names,
-                    custodian=custodian,
-                    folder=folder,
-                    native_file=f"{file_path}/{file_name}" if file_path else file_name,
-                    md5_hash=md5_hash
-                )
-                emails.append(email)
-                self.stats["emails_found"] += 1
-                if has_att:
-                    self.stats["emails_with_attachments"] += 1
-
-            elif doc_type == "File":
-                # This is an attachment
-                # Parent doc_id is everything before the last .N suffix
-                parent_match = re.match(r"(.+)\.(\d+)$", doc_id)
-                if parent_match:
-                    parent_doc_id = parent_match.group(1)
-                else:
-                    parent_doc_id = ""
-
-                filename = self._parse_tag_value(doc, "#FileName")
-                extension = self._parse_tag_value(doc, "#FileExtension")
-                file_size = int(self._parse_tag_value(doc, "#FileSize") or "0")
-
-                # Get native file info
-                file_path, native_filename, native_size, md5_hash = self._parse_file_info(doc)
-
-                attachment = Attachment(
-                    doc_id=doc_id,
-                    filename=filename,
-                    extension=f".{extension}" if extension and not extension.startswith(".") else extension,
-                    file_size=file_size or native_size,
-                    mime_type=mime_type,
-                    md5_hash=md5_hash,
-                    parent_doc_id=parent_doc_id
-                )
-                attachments[doc_id] = attachment
-                self.stats["attachments_found"] += 1
 
         return emails, attachments
 
+    def _parse_document(self, doc: Any, emails: List[Email], attachments: Dict[str, Attachment]) -> None:
+        """Parse a single Document element into an Email or Attachment."""
+        doc_id = doc.get("DocID", "")
+        doc_type = doc.get("DocType", "")
+        mime_type = doc.get("MimeType", "")
+
+        if doc_type == "Message":
+            # This is an email
+            tags = self._tag_map(doc)
+            has_att = tags.get("#HasAttachments", "").lower() == "true"
+            att_count = int(tags.get("#AttachmentCount") or "0")
+            att_names_str = tags.get("#AttachmentNames", "")
+            att_names = [n.strip() for n in att_names_str.split(";")] if att_names_str else []
+
+            # Get location info
+            location = doc.find("Locations/Location")
+            custodian = ""
+            folder = ""
+            if location is not None:
+                cust_elem = location.find("Custodian")
+                folder_elem = location.find("LocationURI")
+                custodian = cust_elem.text if cust_elem is not None else ""
+                folder = folder_elem.text if folder_elem is not None else ""
+
+            # Get native file info
+            file_path, file_name, file_size, md5_hash = self._parse_file_info(doc)
+
+            email = Email(
+                doc_id=doc_id,
+                from_addr=tags.get("#From", ""),
+                to_addrs=tags.get("#To", ""),
+                cc_addrs=tags.get("#CC", ""),
+                subject=tags.get("#Subject", ""),
+                date_sent=tags.get("#DateSent", ""),
+                has_attachments=has_att,
+                attachment_count=att_count,
+                attachment_names=att_names,
+                custodian=custodian,
+                folder=folder,
+                native_file=f"{file_path}/{file_name}" if file_path else file_name,
+                md5_hash=md5_hash
+            )
+            emails.append(email)
+            self.stats["emails_found"] += 1
+            if has_att:
+                self.stats["emails_with_attachments"] += 1
+
+        elif doc_type == "File":
+            # This is an attachment
+            # Parent doc_id is everything before the last .N suffix
+            head, sep, tail = doc_id.rpartition(".")
+            parent_doc_id = head if sep and tail.isdecimal() else ""
+
+            tags = self._tag_map(doc)
+            filename = tags.get("#FileName", "")
+            extension = tags.get("#FileExtension", "")
+            file_size = int(tags.get("#FileSize") or "0")
+
+            # Get native file info
+            file_path, native_filename, native_size, md5_hash = self._parse_file_info(doc)
+
+            attachment = Attachment(
+                doc_id=doc_id,
+                filename=filename,
+                extension=f".{extension}" if extension and not extension.startswith(".") else extension,
+                file_size=file_size or native_size,
+                mime_type=mime_type,
+                md5_hash=md5_hash,
+                parent_doc_id=parent_doc_id
+            )
+            attachments[doc_id] = attachment
+            self.stats["attachments_found"] += 1
+
+    def _build_zip_index(self, zip_file: zipfile.ZipFile) -> Dict[str, Any]:
+        """
+        Index ZIP entries by basename and by their last two path components,
+        and group them by file extension for the fallback scan.
+        """
+        entries = zip_file.infolist()
+        by_basename: Dict[str, zipfile.ZipInfo] = {}
+        by_suffix_tail: Dict[str, zipfile.ZipInfo] = {}
+        by_extension: Dict[str, List[zipfile.ZipInfo]] = {}
+        for info in entries:
+            path = PurePosixPath(info.filename)
+            parts = path.parts
+            if not parts:
+                continue
+            # First entry wins, as with the previous namelist() scan
+            by_basename.setdefault(parts[-1], info)
+            by_suffix_tail.setdefault("/".join(parts[-2:]), info)
+            by_extension.setdefault(path.suffix.lower(), []).append(info)
+        return {
+            "entries": entries,
+            "basename": by_basename,
+            "suffix_tail": by_suffix_tail,
+            "extension": by_extension,
+        }
+
+    def _find_zip_entry(
+        self,
+        zip_index: Dict[str, Any],
+        native_filename: str
+    ) -> Optional[zipfile.ZipInfo]:
+        """Look up the ZIP entry for a native file, falling back to a scan on a miss."""
+        info = zip_index["basename"].get(native_filename)
+        if info is None:
+            info = zip_index["suffix_tail"].get(native_filename)
+        if info is None:
+            # With a real file extension, only entries sharing it are scanned.
+            # A suffix such as ".1" from a doc_id is no guide, so scan them all
+            extension = PurePosixPath(native_filename).suffix.lower()
+            if _FILE_EXTENSION_RE.fullmatch(extension):
+                candidates = zip_index["extension"].get(extension, ())
+            else:
+                candidates = zip_index["entries"]
+            for candidate in candidates:
+                name = candidate.filename
+                if name.endswith(native_filename) or native_filename in name:
+                    return candidate
+        return info
+
     def _extract_attachment_file(
         self,
         zip_file: zipfile.ZipFile,
+        info: zipfile.ZipInfo,
         attachment: Attachment,
-        native_filename: str
+        raw: Optional[RawZip] = None
     ) -> bool:
         """Extract an attachment file from the ZIP."""
-        # Find the file in the ZIP
-        matching_files = [
-            n for n in zip_file.namelist()
-            if n.endswith(native_filename) or native_filename in n
-        ]
-
-        if not matching_files:
-            if self.verbose:
-                print(f"  File not found in ZIP: {native_filename}")
-            return False
-
-        file_path = matching_files[0]
-
         try:
-            # Read the file
-            data = zip_file.read(file_path)
-
-            # Check size
-            if len(data) > self.max_attachment_size:
-                self.stats["attachments_too_large"] += 1
+            # Check size before touching the payload
+            if info.file_size > self.max_attachment_size:
+                self._count("attachments_too_large")
                 if self.verbose:
-                    print(f"  Attachment too large: {attachment.filename} ({len(data)} bytes)")
+                    print(f"  Attachment too large: {attachment.filename} ({info.file_size} bytes)")
                 return False
 
-            # Compute SHA256
-            sha256_hash = self._compute_sha256(data)
-            attachment.sha256_hash = sha256_hash
-
-            # Check for duplicate
-            if sha256_hash in self.hash_cache:
-                attachment.storage_path = self.hash_cache[sha256_hash]
-                self.stats["attachments_deduplicated"] += 1
+            if not self._store(zip_file, info, attachment, raw):
+                # Storage is keyed by content hash, so an existing file is a duplicate
+                self._count("attachments_deduplicated")
                 return True
 
-            # Write to storage
-            storage_path = self._get_storage_path(sha256_hash, attachment.extension)
-            with open(storage_path, "wb") as f:
-                f.write(data)
-
-            attachment.storage_path = storage_path
-            self.hash_cache[sha256_hash] = storage_path
-            self.stats["attachments_extracted"] += 1
-            self.stats["bytes_extracted"] += len(data)
+            with self._lock:
+                self.stats["attachments_extracted"] += 1
+                self.stats["bytes_extracted"] += info.file_size
 
             return True
 
         except Exception as e:
-            self.stats["errors"] += 1
+            self._count("errors")
             if self.verbose:
                 print(f"  Error extracting {attachment.filename}: {e}", file=sys.stderr)
             return False
 
-    def process_zip(self, zip_path: str) -> None:
-        """Process a single EDRM ZIP file."""
+    def _store(
+        self,
+        zip_file: zipfile.ZipFile,
+        info: zipfile.ZipInfo,
+        attachment: Attachment,
+        raw: Optional[RawZip] = None
+    ) -> bool:
+        """
+        Write a ZIP entry to its storage path atomically, setting the
+        attachment's sha256_hash and storage_path.
+
+        The entry is written to a temporary file in the attachments directory
+        and then hard-linked to the path for its hash, which fails if that
+        content is already stored (by this or another thread or process).
+        Returns False in that case, discarding the temporary file.
+
+        Stored (uncompressed) entries in the memory-mapped ZIP are hashed
+        first, which is cheap, and copied (see _write_stored) only if new.
+        Others are hashed while they are written (see _write_entry), so each
+        is inflated only once.
+        """
+        mapped_stored = (raw is not None and info.compress_type == zipfile.ZIP_STORED
+                         and not info.flag_bits & 0x1)
+        if mapped_stored:
+            attachment.sha256_hash = self._hash_stored(raw, info)
+            attachment.storage_path = self._get_storage_path(attachment.sha256_hash, attachment.extension)
+            if os.path.exists(attachment.storage_path):
+                return False
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.attachments_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as dst:
+                if mapped_stored:
+                    self._write_stored(raw, info, dst)
+                else:
+                    attachment.sha256_hash = self._write_entry(zip_file, info, raw, dst)
+                    attachment.storage_path = self._get_storage_path(
+                        attachment.sha256_hash, attachment.extension
+                    )
+            try:
+                os.link(tmp_path, attachment.storage_path)
+            except FileExistsError:
+                return False
+            except OSError:
+                # No hard links on this filesystem; same bytes either way
+                os.replace(tmp_path, attachment.storage_path)
+            return True
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    def _hash_stored(self, raw: RawZip, info: zipfile.ZipInfo) -> str:
+        """
+        Compute the SHA256 of a stored entry straight from the memory-mapped
+        ZIP, checking its CRC-32 as zipfile would.
+        """
+        offset = self._payload_offset(raw.view, info)
+        with raw.view[offset:offset + info.compress_size] as data:
+            if len(data) != info.file_size or zlib.crc32(data) != info.CRC:
+                raise zipfile.BadZipFile(f"Bad CRC-32 for file {info.filename!r}")
+            return hashlib.sha256(data).hexdigest()
+
+    def _write_entry(self, zip_file: zipfile.ZipFile, info: zipfile.ZipInfo, raw: Optional[RawZip], dst) -> str:
+        """
+        Write an entry's uncompressed bytes to dst and return their SHA256.
+
+        Deflated entries are inflated straight from the memory-mapped ZIP
+        through a zlib decompressor, with the CRC-32 checked as zipfile
+        would. Anything else (encrypted, bzip2, lzma) is streamed through
+        zipfile, which checks it.
+        """
+        digest = hashlib.sha256()
+        if raw is None or info.flag_bits & 0x1 or info.compress_type != zipfile.ZIP_DEFLATED:
+            with zip_file.open(info) as src:
+                for chunk in iter(lambda: src.read(COPY_BUFSIZE), b""):
+                    digest.update(chunk)
+                    dst.write(chunk)
+            return digest.hexdigest()
+
+        offset = self._payload_offset(raw.view, info)
+        inflater = zlib.decompressobj(-zlib.MAX_WBITS)
+        crc = size = 0
+        with raw.view[offset:offset + info.compress_size] as data:
+            for start in range(0, len(data), COPY_BUFSIZE):
+                chunk = inflater.decompress(data[start:start + COPY_BUFSIZE])
+                digest.update(chunk)
+                crc = zlib.crc32(chunk, crc)
+                size += len(chunk)
+                dst.write(chunk)
+        chunk = inflater.flush()
+        digest.update(chunk)
+        crc = zlib.crc32(chunk, crc)
+        size += len(chunk)
+        dst.write(chunk)
+
+        if size != info.file_size or crc != info.CRC:
+            raise zipfile.BadZipFile(f"Bad CRC-32 for file {info.filename!r}")
+        return digest.hexdigest()
+
+    @staticmethod
+    def _payload_offset(view: memoryview, info: zipfile.ZipInfo) -> int:
+        """Offset of an entry's data in the ZIP file, read from its local file header."""
+        signature, name_len, extra_len = _LOCAL_HEADER.unpack_from(view, info.header_offset)
+        if signature != b"PK\x03\x04":
+            raise zipfile.BadZipFile(f"Bad local file header for {info.filename}")
+        return info.header_offset + _LOCAL_HEADER.size + name_len + extra_len
+
+    def _write_stored(self, raw: RawZip, info: zipfile.ZipInfo, dst) -> None:
+        """
+        Write a stored (uncompressed, unencrypted) entry straight from the ZIP file.
+
+        Uses os.copy_file_range so the bytes stay in the kernel, or writes
+        the mapped slice when the kernel cannot copy between these files.
+        The CRC has already been checked by _hash_stored.
+        """
+        offset = self._payload_offset(raw.view, info)
+        remaining = info.file_size
+        if hasattr(os, "copy_file_range"):
+            dst.flush()
+            while remaining:
+                try:
+                    copied = os.copy_file_range(raw.fd, dst.fileno(), remaining, offset)
+                except OSError as e:
+                    if remaining == info.file_size and e.errno in _NO_COPY_RANGE_ERRNOS:
+                        break
+                    raise
+                if not copied:
+                    raise zipfile.BadZipFile(f"Truncated entry {info.filename}")
+                offset += copied
+                remaining -= copied
+
+        if remaining:
+            with raw.view[offset:offset + remaining] as data:
+                dst.write(data)
+
+    def process_zip(self, zip_path: str) -> Tuple[List[Email], List[Attachment]]:
+        """Process a single EDRM ZIP file, returning its emails and extracted attachments."""
         print(f"Processing: {zip_path}")
+        zip_emails: List[Email] = []
+        zip_attachments: List[Attachment] = []
 
         try:
-            with zipfile.ZipFile(zip_path, "r") as zf:
+            # The raw, memory-mapped file lets entries be hashed and copied
+            # without going through zipfile's read buffers
+            with zipfile.ZipFile(zip_path, "r") as zf, open(zip_path, "rb") as zip_fp, \
+                    mmap.mmap(zip_fp.fileno(), 0, access=mmap.ACCESS_READ) as mapped, \
+                    memoryview(mapped) as view:
+                raw = RawZip(zip_fp.fileno(), view)
+
                 # Find the XML metadata file
                 xml_files = [n for n in zf.namelist() if n.endswith(".xml") and "zl_" in n]
 
                 if not xml_files:
                     print(f"  No XML metadata file found")
-                    return
+                    return zip_emails, zip_attachments
+
+                zip_index = self._build_zip_index(zf)
 
                 # Process each XML file (usually just one)
                 for xml_file in xml_files:
-                    xml_content = zf.read(xml_file).decode("utf-8", errors="replace")
-                    emails, attachments = self._parse_xml(xml_content)
+                    with zf.open(xml_file) as xml_stream:
+                        emails, attachments = self._parse_xml(xml_stream)
 
-                    self.emails.extend(emails)
+                    zip_emails.extend(emails)
 
-                    # Extract attachment files
+                    work: List[Tuple[Attachment, zipfile.ZipInfo]] = []
                     for doc_id, attachment in attachments.items():
-                        # Build the expected native filename
+                        # The expected native filename is the doc_id plus extension
                         native_filename = f"{doc_id}{attachment.extension}"
-
-                        if self._extract_attachment_file(zf, attachment, native_filename):
-                            self.attachments.append(attachment)
+                        info = self._find_zip_entry(zip_index, native_filename)
+                        if info is None:
+                            if self.verbose:
+                                print(f"  File not found in ZIP: {native_filename}")
+                            continue
+                        work.append((attachment, info))
+
+                    # Extract attachment files in parallel; zlib and hashlib
+                    # release the GIL, and ZipFile reads are safe across threads.
+                    # Submitting in file order turns the reads into a forward
+                    # scan of the ZIP that readahead can keep up with.
+                    futures: List[Any] = [None] * len(work)
+                    with ThreadPoolExecutor(max_workers=self.threads) as executor:
+                        for i in sorted(range(len(work)), key=lambda i: work[i][1].header_offset):
+                            attachment, info = work[i]
+                            futures[i] = executor.submit(self._extract_attachment_file, zf, info, attachment, raw)
+
+                        # Keep document order in the output
+                        for (attachment, _), future in zip(work, futures):
+                            if future.result():
+                                zip_attachments.append(attachment)
 
                 self.stats["zips_processed"] += 1
 
@@ -306,24 +581,73 @@ class EDRMExtractor:
             print(f"  Error processing {zip_path}: {e}", file=sys.stderr)
             self.stats["errors"] += 1
 
+        return zip_emails, zip_attachments
+
+    def process_zips(self, zip_paths: List[str], workers: int = 1) -> None:
+        """
+        Process several EDRM ZIP files, optionally across worker processes.
+
+        Each worker process extracts one ZIP at a time with its own
+        extractor; the results are merged here in submission order.
+        """
+        self._open_outputs()
+
+        if workers <= 1:
+            for zip_path in zip_paths:
+                self._save_records(*self.process_zip(zip_path))
+            return
+
+        args = [
+            (zip_path, str(self.output_dir), str(self.attachments_dir), self.max_attachment_size,
+             self.verbose, self.threads)
+            for zip_path in zip_paths
+        ]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for result in executor.map(_process_zip_worker, args):
+                self._merge_zip_result(*result)
+
+    def _merge_zip_result(
+        self,
+        emails: List[Email],
+        attachments: List[Attachment],
+        stats: Dict[str, int]
+    ) -> None:
+        """Fold one worker's ZIP results into this extractor."""
+        for key, value in stats.items():
+            self.stats[key] += value
+
+        self._save_records(emails, attachments)
+
+    def _output_path(self, name: str) -> Path:
+        """Path of a result file in the configured output format."""
+        return self.output_dir / f"{name}.{self.output_format}"
+
+    def _open_outputs(self) -> None:
+        """Open the result files, replacing any previous run."""
+        if self._emails_fp is None:
+            self._emails_fp = open(self._output_path(EMAILS_FILE), "wb")
+            self._attachments_fp = open(self._output_path(ATTACHMENTS_FILE), "wb")
+
+    def _save_records(self, emails: List[Email], attachments: List[Attachment]) -> None:
+        """Append one ZIP's emails and attachments to the result files."""
+        encode = _msgpack_record if self.output_format == "msgpack" else _json_line
+        self._emails_fp.writelines(encode(e) for e in emails)
+        self._attachments_fp.writelines(encode(a) for a in attachments)
+        self.emails_saved += len(emails)
+        self.attachments_saved += len(attachments)
+
     def save_results(self) -> None:
-        """Save extraction results to JSON files."""
-        # Save emails
-        emails_file = self.output_dir / "edrm_emails.json"
-        with open(emails_file, "w") as f:
-            json.dump([asdict(e) for e in self.emails], f, indent=2)
-        print(f"Saved {len(self.emails)} emails to {emails_file}")
-
-        # Save attachments
-        attachments_file = self.output_dir / "edrm_attachments.json"
-        with open(attachments_file, "w") as f:
-            json.dump([asdict(a) for a in self.attachments], f, indent=2)
-        print(f"Saved {len(self.attachments)} attachments to {attachments_file}")
+        """Finish the result files and save extraction stats."""
+        self._open_outputs()
+        self._emails_fp.close()
+        self._attachments_fp.close()
+        self._emails_fp = self._attachments_fp = None
+        print(f"Saved {self.emails_saved} emails to {self._output_path(EMAILS_FILE)}")
+        print(f"Saved {self.attachments_saved} attachments to {self._output_path(ATTACHMENTS_FILE)}")
 
         # Save stats
         stats_file = self.output_dir / "edrm_stats.json"
-        with open(stats_file, "w") as f:
-            json.dump(self.stats, f, indent=2)
+        _write_json(stats_file, self.stats)
 
     def print_stats(self) -> None:
         """Print extraction statistics."""
@@ -342,6 +666,48 @@ class EDRMExtractor:
         print("=" * 60)
 
 
+def _json_line(record: Any) -> bytes:
+    """Encode a dataclass record as a single NDJSON line."""
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(_record_dict(record)).encode("utf-8") + b"\n"
+
+
+def _msgpack_record(record: Any) -> bytes:
+    """Encode a dataclass record as one msgpack object."""
+    return msgpack.packb(_record_dict(record))
+
+
+def _record_dict(record: Any) -> Dict[str, Any]:
+    """Shallow field dict of a slotted dataclass (cheaper than asdict's deep copy)."""
+    return {name: getattr(record, name) for name in record.__slots__}
+
+
+def _write_json(path: Path, data: Any) -> None:
+    """Write data (which may contain dataclasses) as indented JSON."""
+    if orjson is not None:
+        # orjson serializes dataclasses (including slotted ones) natively
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2, default=_record_dict)
+
+
+def _process_zip_worker(args: Tuple[str, str, str, int, bool, int]):
+    """Process one ZIP in a worker process and return its results for merging."""
+    zip_path, output_dir, attachments_dir, max_attachment_size, verbose, threads = args
+    extractor = EDRMExtractor(
+        output_dir=output_dir,
+        max_attachment_size=max_attachment_size,
+        verbose=verbose,
+        threads=threads,
+        attachments_dir=attachments_dir
+    )
+    emails, attachments = extractor.process_zip(zip_path)
+    return emails, attachments, extractor.stats
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Extract attachments from EDRM Enron Email Dataset v2"
@@ -356,12 +722,35 @@ def main():
         default="extracted_edrm_data",
         help="Output directory (default: extracted_edrm_data)"
     )
+    parser.add_argument(
+        "--attachments-dir",
+        default=None,
+        help="Attachment store, deduplicated by content (default: <output>/attachments)"
+    )
     parser.add_argument(
         "--max-size",
         type=int,
         default=50,
         help="Maximum attachment size in MB (default: 50)"
     )
+    parser.add_argument(
+        "-j", "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for extracting ZIPs in parallel (default: CPU count)"
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=None,
+        help="Threads used to extract attachments within a ZIP (default: CPU count / workers)"
+    )
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="jsonl",
+        help="Result file format (default: jsonl; msgpack needs the msgpack package)"
+    )
     parser.add_argument(
         "-v", "--verbose",
         action="store_true",
@@ -370,11 +759,8 @@ def main():
 
     args = parser.parse_args()
 
-    extractor = EDRMExtractor(
-        output_dir=args.output,
-        max_attachment_size=args.max_size * 1024 * 1024,
-        verbose=args.verbose
-    )
+    if args.format == "msgpack" and msgpack is None:
+        parser.error("--format msgpack requires the msgpack package")
 
     # Collect all ZIP files
     zip_files = []
@@ -391,9 +777,21 @@ def main():
 
     print(f"Found {len(zip_files)} ZIP files to process")
 
+    cpu_count = os.cpu_count() or 1
+    workers = args.workers or min(len(zip_files), cpu_count)
+    threads = args.threads or max(1, cpu_count // workers)
+
+    extractor = EDRMExtractor(
+        output_dir=args.output,
+        max_attachment_size=args.max_size * 1024 * 1024,
+        verbose=args.verbose,
+        threads=threads,
+        output_format=args.format,
+        attachments_dir=args.attachments_dir
+    )
+
     # Process each ZIP
-    for zip_path in sorted(zip_files):
-        extractor.process_zip(zip_path)
+    extractor.process_zips(sorted(zip_files), workers=workers)
 
     # Save results
     extractor.save_results()
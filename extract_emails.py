@@ -13,13 +13,38 @@ import tarfile
 import logging
 import hashlib
 import os
+import quopri
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Set
+from typing import Deque, Dict, Iterator, List, Optional, Any, Set, Tuple
 from email.utils import parseaddr, parsedate_to_datetime
-from email.header import Header
 from datetime import datetime
 import re
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - fall back to the stdlib encoder
+    orjson = None
+
+try:
+    from isal import igzip
+except ImportError:  # pragma: no cover - fall back to pigz or zlib
+    igzip = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - only needed for --format msgpack
+    msgpack = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -27,6 +52,121 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Headers parse_email_file reads; _parse_headers leaves the others undecoded
+_PARSED_HEADERS = frozenset((
+    'message-id', 'date', 'from', 'to', 'cc', 'bcc', 'in-reply-to', 'references', 'subject',
+    'content-type', 'content-transfer-encoding', 'content-disposition',
+    'x-from', 'x-to', 'x-cc', 'x-bcc', 'x-folder', 'x-origin', 'x-filename',
+))
+
+# --copy-ready sidecars: one COPY text-format line per email with the sender
+# address and the columns of load_to_postgres.MESSAGE_COLUMNS after
+# from_person_id, in this order (load_to_postgres.SIDECAR_COLUMNS)
+_SIDECAR_FIELDS = (
+    'message_id', 'subject', 'body', 'date', 'timestamp', 'in_reply_to',
+    'mailbox_owner', 'folder_name', 'file_path',
+    'x_from', 'x_to', 'x_cc', 'x_bcc', 'x_folder', 'x_origin', 'x_filename',
+)
+# Characters with special meaning in COPY text format (NUL cannot be stored)
+_COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r', '\0': None})
+
+# Transfer encodings whose bodies are left to the email package to decode
+_FULL_PARSE_ENCODINGS = ('base64', 'x-uuencode', 'uuencode', 'uue', 'x-uue')
+
+# Emails sent to a worker process per task when parsing in parallel
+PARSE_CHUNK_SIZE = 256
+
+# Threads writing attachment files, and how many queued writes may hold
+# their payloads in memory at once
+ATTACHMENT_WRITER_THREADS = 8
+MAX_PENDING_WRITES = 64
+
+# Read buffer for the compressed tarball file. tarfile's own bufsize stays
+# at its 10 KiB default: its stream reader copies the rest of its buffer on
+# every read, so a larger one makes each 512-byte header read that much dearer
+TAR_BUFSIZE = 1024 * 1024
+
+# Header/body separator and a header field name (RFC 5322 ftext) up to its colon
+_HEADER_END_RE = re.compile(rb'\r?\n\r?\n')
+_HEADER_NAME_RE = re.compile(rb'[\x21-\x39\x3b-\x7e]*:')
+
+# Email files in the maildir tree are named like "1.", "2.", ...
+_EMAIL_FILE_RE = re.compile(r'\d+\.$')
+# An address header is safe for the fast path if it has none of these
+# (quoted strings, comments, domain literals, groups, escapes)
+_ADDRESS_SPECIALS_RE = re.compile(r'["()\[\]\\;:]')
+# "addr@domain" or "Display Name <addr@domain>" with dot-atom local part and domain
+_DOT_ATOM = r"[A-Za-z0-9!#$%&'*+/=?^_`{|}~-]+(?:\.[A-Za-z0-9!#$%&'*+/=?^_`{|}~-]+)*"
+_PLAIN_ADDRESS_RE = re.compile(
+    rf"({_DOT_ATOM}@{_DOT_ATOM})|([A-Za-z0-9!#$%&'*+/=?^_`{{|}}~.\s-]*?)\s*<({_DOT_ATOM}@{_DOT_ATOM})>"
+)
+# Message IDs in a References header
+_REFS_RE = re.compile(r'<[^>]+>')
+# Attachment filename cleanup in one str.translate pass: backslashes become
+# path separators, control characters are dropped, unsafe characters become "_"
+_FILENAME_TABLE = {i: None for i in range(32)}
+_FILENAME_TABLE.update({ord(c): '_' for c in '<>:"|?*'})
+_FILENAME_TABLE[ord('\\')] = '/'
+
+
+@lru_cache(maxsize=1 << 16)
+def _parse_date(date_str: str) -> Optional[datetime]:
+    """Parse a Date header, or None if it cannot be parsed (cached: many emails share a timestamp)."""
+    try:
+        return parsedate_to_datetime(date_str)
+    except Exception:
+        return None
+
+
+def _copy_field(value) -> str:
+    """
+    Format a value as a COPY text-format field.
+
+    load_to_postgres formats the rows it copies with this too, so sidecar
+    lines and the loader's own rows are encoded identically.
+    """
+    if value is None:
+        return '\\N'
+    if value is True:
+        return 't'
+    if value is False:
+        return 'f'
+    if isinstance(value, str):
+        return value.translate(_COPY_ESCAPES)
+    return str(value)
+
+
+def _sidecar_line(record: Dict[str, Any]) -> str:
+    """A record's messages row for the --copy-ready sidecar."""
+    from_address = record['from_address']
+    fields = [from_address.lower().strip() if from_address else None]
+    fields.extend(record[field] for field in _SIDECAR_FIELDS)
+    fields.append(bool(record['attachments']))
+    return '\t'.join(map(_copy_field, fields)) + '\n'
+
+
+def _path_id(file_path: str) -> str:
+    """Short stable ID for a file path (the same in every run and worker process, unlike hash())."""
+    return hashlib.blake2b(file_path.encode('utf-8', 'surrogatepass'), digest_size=8).hexdigest()
+
+
+def _write_file(path: str, content: bytes):
+    """
+    Write bytes to a file atomically (run on the attachment writer threads).
+
+    The content goes to a temporary file in the same directory that is then
+    renamed into place, so an interrupted run never leaves a partial file
+    at a path that later runs would treat as already extracted.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
 
 class EmailParser:
     """Parses individual email files into structured data."""
@@ -65,8 +205,19 @@ class EmailParser:
             max_attachment_size: Maximum attachment size in bytes (default 50MB)
         """
         self.attachments_dir = Path(attachments_dir) if attachments_dir else None
+        self._attachments_root = str(attachments_dir) if attachments_dir else None
         self.max_attachment_size = max_attachment_size
-        self.attachment_hashes: Set[str] = set()  # Track seen hashes for deduplication
+        # Raw 32-byte digests of attachments seen so far, for deduplication
+        # (half the memory of the hex strings)
+        self.attachment_hashes: Set[bytes] = set()
+
+        # Attachment files are written on background threads (see _write_attachment)
+        self._writer_pool: Optional[ThreadPoolExecutor] = None
+        self._pending_writes: Deque[Tuple[bytes, Future]] = deque()
+        self._created_shards: Set[str] = set()
+        # For each attachment still being written, the (attachments list,
+        # attachment) entries of the records that refer to it
+        self._unwritten: Dict[bytes, List[Tuple[List[Dict[str, Any]], Dict[str, Any]]]] = {}
 
         self.stats = {
             'total': 0,
@@ -81,21 +232,68 @@ class EmailParser:
         }
 
     @staticmethod
-    def _header_to_str(value) -> str:
+    def _parse_headers(content: bytes) -> Tuple[Dict[str, str], bytes]:
         """
-        Convert email header value to string, handling Header objects.
+        Split a raw message into its headers and body without building a Message.
+
+        Folded lines are unfolded the same way the email package does it
+        (line breaks are kept), only the first occurrence of a header is
+        kept, and a line that is not a valid header starts the body. Only
+        the headers in _PARSED_HEADERS are joined and decoded to str.
 
         Args:
-            value: Header value (could be str, Header object, or None)
+            content: Raw email content as bytes
 
         Returns:
-            String representation, or empty string if None
+            Tuple of (parsed headers keyed by lowercase name, raw body bytes)
         """
-        if value is None:
-            return ''
-        if isinstance(value, Header):
-            return str(value)
-        return value
+        end = _HEADER_END_RE.search(content)
+        if end:
+            header_block, body = content[:end.start()], content[end.end():]
+        else:
+            header_block, body = content, b''
+
+        headers: Dict[str, str] = {}
+        name = None
+        value: List[bytes] = []
+        offset = 0
+        for line in header_block.split(b'\n'):
+            if line[:1] in (b' ', b'\t'):
+                if name is not None:
+                    value.append(line)
+            else:
+                match = _HEADER_NAME_RE.match(line)
+                if match is None:
+                    # Missing separator line: the rest is body
+                    body = content[offset:]
+                    break
+                if name in _PARSED_HEADERS and name not in headers:
+                    headers[name] = b'\n'.join(value).rstrip(b'\r\n').decode('utf-8', errors='replace')
+                name = line[:match.end() - 1].decode('ascii').lower()
+                value = [line[match.end():].lstrip(b' \t')]
+            offset += len(line) + 1
+
+        if name in _PARSED_HEADERS and name not in headers:
+            headers[name] = b'\n'.join(value).rstrip(b'\r\n').decode('utf-8', errors='replace')
+        return headers, body
+
+    def _needs_full_parse(self, headers: Dict[str, str]) -> bool:
+        """Whether a message needs the email package (MIME structure, base64/uuencoded body or attachments)."""
+        content_type = headers.get('content-type', '').split(';', 1)[0].strip().lower()
+        if content_type.startswith(('multipart/', 'message/')):
+            return True
+        if self._transfer_encoding(headers) in _FULL_PARSE_ENCODINGS:
+            return True
+        if self.attachments_dir is None:
+            return False
+        if 'attachment' in headers.get('content-disposition', '').lower():
+            return True
+        return '/' in content_type and content_type not in ('text/plain', 'text/html')
+
+    @staticmethod
+    def _transfer_encoding(headers: Dict[str, str]) -> str:
+        """Content-Transfer-Encoding as Message.get_payload compares it (lowercased, not stripped)."""
+        return headers.get('content-transfer-encoding', '').lower()
 
     def parse_email_file(self, content: bytes, file_path: str) -> Optional[Dict[str, Any]]:
         """
@@ -111,57 +309,64 @@ class EmailParser:
         self.stats['total'] += 1
 
         try:
-            # Parse email using Python's email library
-            msg = email.message_from_bytes(content)
+            headers, raw_body = self._parse_headers(content)
 
             # Extract basic headers
-            message_id = self._header_to_str(msg.get('Message-ID')).strip()
+            message_id = headers.get('message-id', '').strip()
             if not message_id:
                 self.stats['missing_message_id'] += 1
                 # Generate a fallback ID based on file path
-                message_id = f"<missing-{hash(file_path)}@enron.com>"
+                message_id = f"<missing-{_path_id(file_path)}@enron.com>"
 
             # Parse date
-            date_str = msg.get('Date')
-            try:
-                date = parsedate_to_datetime(date_str) if date_str else None
-            except Exception as e:
-                logger.debug(f"Date parse error for {file_path}: {e}")
-                date = None
+            date_str = headers.get('date')
+            date = _parse_date(date_str) if date_str else None
+            if date_str and date is None:
+                logger.debug(f"Date parse error for {file_path}: {date_str!r}")
                 self.stats['missing_date'] += 1
 
             # Parse sender
-            from_header = self._header_to_str(msg.get('From'))
+            from_header = headers.get('from', '')
             from_name, from_address = parseaddr(from_header)
 
             # Parse recipients
-            to_addresses = self._parse_addresses(self._header_to_str(msg.get('To')))
-            cc_addresses = self._parse_addresses(self._header_to_str(msg.get('Cc')))
-            bcc_addresses = self._parse_addresses(self._header_to_str(msg.get('Bcc')))
+            to_addresses = self._parse_addresses(headers.get('to'))
+            cc_addresses = self._parse_addresses(headers.get('cc'))
+            bcc_addresses = self._parse_addresses(headers.get('bcc'))
 
             # Extract threading headers
-            in_reply_to = self._header_to_str(msg.get('In-Reply-To')).strip()
-            references = self._parse_references(self._header_to_str(msg.get('References')))
+            in_reply_to = headers.get('in-reply-to', '').strip()
+            references = self._parse_references(headers.get('references'))
 
             # Extract X-headers (Enron-specific metadata)
-            x_from = self._header_to_str(msg.get('X-From')).strip()
-            x_to = self._header_to_str(msg.get('X-To')).strip()
-            x_cc = self._header_to_str(msg.get('X-cc')).strip()
-            x_bcc = self._header_to_str(msg.get('X-bcc')).strip()
-            x_folder = self._header_to_str(msg.get('X-Folder')).strip()
-            x_origin = self._header_to_str(msg.get('X-Origin')).strip()
-            x_filename = self._header_to_str(msg.get('X-FileName')).strip()
-
-            # Extract body
-            body = self._extract_body(msg)
-
-            # Extract attachments (if attachments_dir is configured)
-            attachments = self._extract_attachments(msg, file_path)
+            x_from = headers.get('x-from', '').strip()
+            x_to = headers.get('x-to', '').strip()
+            x_cc = headers.get('x-cc', '').strip()
+            x_bcc = headers.get('x-bcc', '').strip()
+            # Folder and origin repeat across most of a mailbox; interned, each
+            # value is one object (and one pickle memo entry per worker chunk)
+            x_folder = sys.intern(headers.get('x-folder', '').strip())
+            x_origin = sys.intern(headers.get('x-origin', '').strip())
+            x_filename = headers.get('x-filename', '').strip()
+
+            if self._needs_full_parse(headers):
+                # MIME structure or encoded payload: let the email package handle it
+                msg = email.message_from_bytes(content)
+                body = self._extract_body(msg)
+                attachments = self._extract_attachments(msg, file_path)
+            else:
+                # Single-part: the body is the raw bytes after the headers,
+                # undoing quoted-printable as get_payload(decode=True) would
+                if self._transfer_encoding(headers) == 'quoted-printable':
+                    raw_body = quopri.decodestring(raw_body)
+                body = raw_body.decode('utf-8', errors='ignore')
+                attachments = []
 
             # Parse file path to extract mailbox info
-            path_parts = Path(file_path).parts
-            mailbox_owner = path_parts[1] if len(path_parts) > 1 else None
-            folder_name = path_parts[2] if len(path_parts) > 2 else None
+            # Tar member names are POSIX paths: maildir/<owner>/<folder>/...
+            path_parts = file_path.removeprefix('./').split('/', 3)
+            mailbox_owner = sys.intern(path_parts[1]) if len(path_parts) > 1 else None
+            folder_name = sys.intern(path_parts[2]) if len(path_parts) > 2 else None
 
             parsed_data = {
                 'message_id': message_id,
@@ -172,7 +377,7 @@ class EmailParser:
                 'to_addresses': to_addresses,
                 'cc_addresses': cc_addresses,
                 'bcc_addresses': bcc_addresses,
-                'subject': self._header_to_str(msg.get('Subject')).strip(),
+                'subject': headers.get('subject', '').strip(),
                 'in_reply_to': in_reply_to if in_reply_to else None,
                 'references': references,
                 'body': body,
@@ -203,6 +408,24 @@ class EmailParser:
         if not header:
             return []
 
+        # Fast path for the usual Enron headers: comma-separated plain
+        # addresses, optionally as "Display Name <addr>" without quoting
+        if not _ADDRESS_SPECIALS_RE.search(header):
+            addresses = []
+            for token in header.split(','):
+                match = _PLAIN_ADDRESS_RE.fullmatch(token.strip())
+                if match is None:
+                    if token.strip():
+                        break
+                    continue
+                addr, name, bracketed = match.groups()
+                addresses.append({
+                    'name': ' '.join(name.split()) if name else '',
+                    'address': (addr or bracketed).lower()
+                })
+            else:
+                return addresses
+
         addresses = []
         for name, addr in email.utils.getaddresses([header]):
             if addr:
@@ -218,7 +441,7 @@ class EmailParser:
             return []
 
         # References can be space or newline separated
-        refs = re.findall(r'<[^>]+>', references)
+        refs = _REFS_RE.findall(references)
         return [ref.strip() for ref in refs]
 
     def _extract_body(self, msg: Message) -> str:
@@ -266,16 +489,19 @@ class EmailParser:
         attachment_order = 0
 
         for part in msg.walk():
+            # Everything needed to reject a part is read from its headers,
+            # before its payload is decoded
             content_type = part.get_content_type()
-            content_disposition = str(part.get('Content-Disposition', ''))
 
             # Skip multipart containers
-            if part.get_content_maintype() == 'multipart':
+            if content_type.startswith('multipart/'):
                 continue
 
+            content_disposition = str(part.get('Content-Disposition', '')).lower()
+
             # Skip text/plain and text/html unless explicitly marked as attachment
             if content_type in ('text/plain', 'text/html'):
-                if 'attachment' not in content_disposition.lower():
+                if 'attachment' not in content_disposition:
                     continue
 
             try:
@@ -291,36 +517,43 @@ class EmailParser:
                     continue
 
                 # Compute SHA256 hash
-                sha256_hash = hashlib.sha256(payload).hexdigest()
+                digest = hashlib.sha256(payload).digest()
+                sha256_hash = digest.hex()
 
                 # Get filename (multiple fallback strategies)
                 filename = self._get_attachment_filename(part, sha256_hash, content_type)
 
                 # Determine if inline
-                is_inline = 'inline' in content_disposition.lower()
+                is_inline = 'inline' in content_disposition
                 content_id = part.get('Content-ID', '').strip('<>')
 
-                # Check for deduplication
-                if sha256_hash in self.attachment_hashes:
-                    self.stats['attachments_deduplicated'] += 1
-                    # Still record metadata, but don't write file again
-                    storage_path = self._get_storage_path(sha256_hash)
-                else:
-                    # Write file to disk
-                    storage_path = self._write_attachment(sha256_hash, payload)
-                    self.attachment_hashes.add(sha256_hash)
-                    self.stats['attachments_extracted'] += 1
-
-                attachments.append({
+                attachment = {
                     'sha256_hash': sha256_hash,
                     'original_filename': filename,
-                    'mime_type': content_type,
+                    'mime_type': sys.intern(content_type),
                     'file_size': len(payload),
-                    'storage_path': storage_path,
+                    'storage_path': self._get_storage_path(sha256_hash),
                     'is_inline': is_inline,
                     'content_id': content_id if content_id else None,
                     'attachment_order': attachment_order
-                })
+                }
+
+                # Check for deduplication
+                if digest in self.attachment_hashes:
+                    # Still record metadata, but don't write file again
+                    self.stats['attachments_deduplicated'] += 1
+                else:
+                    # Write file to disk
+                    self._write_attachment(digest, payload)
+                    self.attachment_hashes.add(digest)
+                    self.stats['attachments_extracted'] += 1
+
+                # Until the file is written, it may yet be dropped (see _finish_write)
+                references = self._unwritten.get(digest)
+                if references is not None:
+                    references.append((attachments, attachment))
+
+                attachments.append(attachment)
                 attachment_order += 1
 
             except Exception as e:
@@ -361,14 +594,8 @@ class EmailParser:
         if isinstance(filename, bytes):
             filename = filename.decode('utf-8', errors='ignore')
 
-        # Remove path components
-        filename = filename.replace('\\', '/').split('/')[-1]
-
-        # Remove null bytes and control characters
-        filename = ''.join(c for c in filename if ord(c) >= 32)
-
-        # Remove potentially dangerous characters
-        filename = re.sub(r'[<>:"|?*]', '_', filename)
+        # Remove control and dangerous characters, then path components
+        filename = filename.translate(_FILENAME_TABLE).rsplit('/', 1)[-1]
 
         # Limit length (preserve extension)
         if len(filename) > 255:
@@ -390,19 +617,63 @@ class EmailParser:
         """
         return f"{sha256_hash[:2]}/{sha256_hash[2:4]}/{sha256_hash}"
 
-    def _write_attachment(self, sha256_hash: str, content: bytes) -> str:
-        """Write attachment to disk with sharded directory structure."""
-        storage_path = self._get_storage_path(sha256_hash)
-        full_path = self.attachments_dir / storage_path
-
-        # Create parent directories
-        full_path.parent.mkdir(parents=True, exist_ok=True)
+    def _write_attachment(self, digest: bytes, content: bytes):
+        """
+        Queue an attachment to be written to disk with sharded directory structure.
 
-        # Write file
-        with open(full_path, 'wb') as f:
-            f.write(content)
+        Writes run on a small thread pool so parsing does not wait on file
+        I/O; at most MAX_PENDING_WRITES payloads are held in memory. Call
+        flush() to wait for them before writing out the records that refer
+        to them: a failed write removes the attachment from those records.
+        """
+        sha256_hash = digest.hex()
+        full_path = os.path.join(self._attachments_root, self._get_storage_path(sha256_hash))
+
+        # Storage is keyed by content hash: a file already at the path was
+        # written by another worker process or an earlier run
+        if os.path.exists(full_path):
+            return
+
+        # Create parent directories once per shard
+        shard = sha256_hash[:4]
+        if shard not in self._created_shards:
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            self._created_shards.add(shard)
+
+        if self._writer_pool is None:
+            self._writer_pool = ThreadPoolExecutor(max_workers=ATTACHMENT_WRITER_THREADS)
+        while len(self._pending_writes) >= MAX_PENDING_WRITES:
+            self._finish_write(*self._pending_writes.popleft())
+        self._unwritten[digest] = []
+        self._pending_writes.append((digest, self._writer_pool.submit(_write_file, full_path, content)))
+
+    def _finish_write(self, digest: bytes, future: Future):
+        """
+        Wait for a queued attachment write.
 
-        return storage_path
+        If it failed, the attachment is counted as an error and removed from
+        every record that refers to it, so no record points at a missing
+        file, and it is forgotten, so its next copy is written again.
+        """
+        references = self._unwritten.pop(digest)
+        error = future.exception()
+        if error is None:
+            return
+
+        self.stats['attachment_errors'] += 1
+        self.stats['attachments_extracted'] -= 1
+        self.stats['attachments_deduplicated'] -= len(references) - 1
+        logger.error(f"Error writing attachment {digest.hex()}: {error}")
+        self.attachment_hashes.discard(digest)
+        for attachments, attachment in references:
+            attachments[:] = [other for other in attachments if other is not attachment]
+            for order, remaining in enumerate(attachments):
+                remaining['attachment_order'] = order
+
+    def flush(self):
+        """Wait until all queued attachment files have been written."""
+        while self._pending_writes:
+            self._finish_write(*self._pending_writes.popleft())
 
     def print_stats(self):
         """Print parsing statistics."""
@@ -424,6 +695,114 @@ class EmailParser:
         logger.info("=" * 60)
 
 
+@contextmanager
+def open_tarball_stream(tarball_path: Path) -> Iterator[tarfile.TarFile]:
+    """
+    Open a gzipped tarball as a forward-only stream.
+
+    Decompression uses ISA-L (python-isal) when it is installed, or a
+    pigz subprocess when pigz is on PATH, so inflating overlaps with
+    parsing; otherwise tarfile's own zlib-based gzip reader is used.
+    """
+    if igzip is not None:
+        logger.info("Decompressing with ISA-L")
+        with igzip.open(tarball_path, 'rb') as fileobj, \
+                tarfile.open(fileobj=fileobj, mode='r|') as tar:
+            yield tar
+        return
+
+    pigz = shutil.which('pigz')
+    if pigz is None:
+        with open(tarball_path, 'rb', buffering=TAR_BUFSIZE) as fileobj, \
+                tarfile.open(fileobj=fileobj, mode='r|gz') as tar:
+            yield tar
+        return
+
+    logger.info(f"Decompressing with {pigz}")
+    proc = subprocess.Popen([pigz, '-dc', str(tarball_path)], stdout=subprocess.PIPE, bufsize=TAR_BUFSIZE)
+    try:
+        with tarfile.open(fileobj=proc.stdout, mode='r|') as tar:
+            yield tar
+    finally:
+        # Closing the pipe early (--limit, or a reader that stops) ends pigz with SIGPIPE
+        proc.stdout.close()
+        if proc.wait() not in (0, -signal.SIGPIPE):
+            logger.warning(f"pigz exited with status {proc.returncode}")
+
+
+class BatchWriter:
+    """
+    Streams parsed emails to newline-delimited JSON batch files.
+
+    Each email is written as soon as it is parsed, so memory use does not
+    depend on the batch size; a new file is started every batch_size emails.
+    Records are NDJSON (.jsonl) by default, or a stream of msgpack objects
+    (.msgpack), which is smaller and faster for the loader to decode.
+
+    With copy_ready, each batch also gets a .messages.tsv sidecar holding
+    its messages rows in COPY text format, which the loader streams to
+    Postgres as is; the body is then only written there, not in the batch,
+    and each record is marked 'copy_ready' so the loader knows to use the
+    sidecar. Without it, a sidecar left by an earlier run is removed, so it
+    is never mistaken for this batch's.
+    """
+
+    def __init__(self, output_dir: Path, batch_size: int = 1000, output_format: str = 'jsonl',
+                 copy_ready: bool = False):
+        self.output_dir = output_dir
+        self.batch_size = batch_size
+        self.output_format = output_format
+        self.copy_ready = copy_ready
+        self.batch_num = 0
+        self.batch_count = 0
+        self._fp = None
+        self._sidecar_fp = None
+        self._output_file = None
+
+    def _encode(self, record: Dict[str, Any]) -> bytes:
+        """Encode a record as a JSON line, or as one msgpack object in a concatenated stream."""
+        if self.output_format == 'msgpack':
+            return msgpack.packb(record)
+        if orjson is not None:
+            return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+        return json.dumps(record).encode('utf-8') + b'\n'
+
+    def write(self, record: Dict[str, Any]):
+        """Append a record to the current batch file, rotating when it is full."""
+        if self._fp is None:
+            self._output_file = self.output_dir / f"emails_batch_{self.batch_num:04d}.{self.output_format}"
+            self._fp = open(self._output_file, 'wb')
+            sidecar_file = self.output_dir / f"emails_batch_{self.batch_num:04d}.messages.tsv"
+            if self.copy_ready:
+                self._sidecar_fp = open(sidecar_file, 'w', encoding='utf-8', newline='')
+            else:
+                sidecar_file.unlink(missing_ok=True)
+
+        if self.copy_ready:
+            self._sidecar_fp.write(_sidecar_line(record))
+            record = {key: value for key, value in record.items() if key != 'body'}
+            record['copy_ready'] = True
+
+        self._fp.write(self._encode(record))
+        self.batch_count += 1
+
+        if self.batch_count >= self.batch_size:
+            self.close()
+
+    def close(self):
+        """Close the current batch file, if one is open."""
+        if self._fp is None:
+            return
+        self._fp.close()
+        if self._sidecar_fp is not None:
+            self._sidecar_fp.close()
+            self._sidecar_fp = None
+        logger.info(f"Wrote batch {self.batch_num} ({self.batch_count} emails) to {self._output_file}")
+        self._fp = None
+        self.batch_num += 1
+        self.batch_count = 0
+
+
 class EnronExtractor:
     """Extracts emails from the Enron tarball."""
 
@@ -450,70 +829,166 @@ class EnronExtractor:
             self.attachments_dir.mkdir(parents=True, exist_ok=True)
             logger.info(f"Attachments will be saved to: {self.attachments_dir}")
 
-    def extract_all(self, limit: Optional[int] = None, batch_size: int = 1000):
+    def extract_all(
+        self,
+        limit: Optional[int] = None,
+        batch_size: int = 1000,
+        workers: int = 1,
+        output_format: str = 'jsonl',
+        copy_ready: bool = False
+    ):
         """
         Extract all emails from the tarball.
 
         Args:
             limit: Maximum number of emails to extract (None for all)
-            batch_size: Number of emails to write per JSON file
+            batch_size: Number of emails to write per batch file
+            workers: Number of parser processes (1 parses in this process)
+            output_format: Batch file format, 'jsonl' or 'msgpack'
+            copy_ready: Also write COPY-ready messages sidecars (see BatchWriter)
         """
         logger.info(f"Opening tarball: {self.tarball_path}")
 
-        with tarfile.open(self.tarball_path, 'r:gz') as tar:
-            # Filter to only email files (numbered files)
-            members = [m for m in tar.getmembers() if m.isfile() and re.match(r'.*\d+\.$', m.name)]
+        if limit:
+            logger.info(f"Limited to {limit} emails")
+
+        # Stream mode reads the gzip stream once, front to back; each member
+        # is parsed as soon as its header has been read
+        with open_tarball_stream(self.tarball_path) as tar:
+            writer = BatchWriter(self.output_dir, batch_size, output_format, copy_ready)
+            emails = self._iter_emails(tar, limit)
+
+            if workers > 1:
+                logger.info(f"Parsing with {workers} worker processes")
+                self._parse_parallel(emails, writer, workers)
+            else:
+                done = 0
+                while True:
+                    chunk = list(islice(emails, PARSE_CHUNK_SIZE))
+                    if not chunk:
+                        break
+                    results = [self.parser.parse_email_file(content, name) for content, name in chunk]
+                    # As in the workers: the chunk's attachment files must be
+                    # on disk (or dropped from its records) before it is written
+                    self.parser.flush()
+                    for parsed in results:
+                        if parsed:
+                            writer.write(parsed)
 
-            total_files = len(members)
-            logger.info(f"Found {total_files} email files")
+                    # Progress logging
+                    if (done + len(chunk)) // 10000 > done // 10000:
+                        logger.info(f"Processed {done + len(chunk):,} emails")
+                    done += len(chunk)
 
-            if limit:
-                members = members[:limit]
-                logger.info(f"Limited to {limit} emails")
+            logger.info(f"Read {self.emails_read:,} email files")
 
-            batch = []
-            batch_num = 0
+            # Finish the last batch file
+            writer.close()
 
-            for idx, member in enumerate(members, 1):
-                try:
-                    # Extract file content
-                    f = tar.extractfile(member)
-                    if f is None:
-                        continue
+        self.parser.print_stats()
+        logger.info(f"Extraction complete. Data saved to {self.output_dir}/")
 
-                    content = f.read()
+    def _iter_emails(self, tar: tarfile.TarFile, limit: Optional[int] = None) -> Iterator[Tuple[bytes, str]]:
+        """Yield (content, member name) for each email file in the tarball."""
+        self.emails_read = 0
 
-                    # Parse email
-                    parsed = self.parser.parse_email_file(content, member.name)
-                    if parsed:
-                        batch.append(parsed)
+        for member in tar:
+            # tarfile records every TarInfo it reads; nothing needs them later
+            tar.members.clear()
 
-                    # Write batch to file
-                    if len(batch) >= batch_size:
-                        self._write_batch(batch, batch_num)
-                        batch_num += 1
-                        batch = []
+            # Only email files (numbered files)
+            if not member.isfile() or not _EMAIL_FILE_RE.search(member.name):
+                continue
+            if limit and self.emails_read >= limit:
+                break
+            self.emails_read += 1
 
-                    # Progress logging
-                    if idx % 10000 == 0:
-                        logger.info(f"Processed {idx:,} / {len(members):,} emails")
+            try:
+                # Extract file content
+                f = tar.extractfile(member)
+                if f is None:
+                    continue
+                content = f.read()
+            except Exception as e:
+                logger.error(f"Error processing {member.name}: {e}")
+                continue
 
-                except Exception as e:
-                    logger.error(f"Error processing {member.name}: {e}")
+            yield content, member.name
 
-            # Write remaining batch
-            if batch:
-                self._write_batch(batch, batch_num)
+    def _parse_parallel(self, emails: Iterator[Tuple[bytes, str]], writer: 'BatchWriter', workers: int):
+        """
+        Parse emails on a process pool while this process keeps reading the tarball.
+
+        Emails are sent to the workers in chunks of PARSE_CHUNK_SIZE, with at
+        most 4 chunks per worker in flight to bound memory. Results are written
+        in tarball order, as in the single-process path.
+        """
+        attachments_dir = str(self.attachments_dir) if self.attachments_dir else None
+        pending: Deque[Future] = deque()
+        done = 0
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(attachments_dir, self.parser.max_attachment_size),
+        ) as pool:
+            while True:
+                chunk = list(islice(emails, PARSE_CHUNK_SIZE))
+                if not chunk:
+                    break
+                if len(pending) >= workers * 4:
+                    done = self._merge_chunk(pending.popleft(), writer, done)
+                pending.append(pool.submit(_parse_chunk, chunk))
+
+            while pending:
+                done = self._merge_chunk(pending.popleft(), writer, done)
+
+    def _merge_chunk(self, future: Future, writer: 'BatchWriter', done: int) -> int:
+        """Write a worker's results and fold its statistics into the parser's."""
+        results, stats = future.result()
+
+        # Workers only see their own attachments, so unique/duplicate counts
+        # are recomputed here against every hash seen so far
+        for key, value in stats.items():
+            if key not in ('attachments_extracted', 'attachments_deduplicated'):
+                self.parser.stats[key] += value
+
+        for parsed in results:
+            if not parsed:
+                continue
+            for attachment in parsed['attachments']:
+                digest = bytes.fromhex(attachment['sha256_hash'])
+                if digest in self.parser.attachment_hashes:
+                    self.parser.stats['attachments_deduplicated'] += 1
+                else:
+                    self.parser.attachment_hashes.add(digest)
+                    self.parser.stats['attachments_extracted'] += 1
+            writer.write(parsed)
+
+        # Progress logging
+        if (done + len(results)) // 10000 > done // 10000:
+            logger.info(f"Processed {done + len(results):,} emails")
+        return done + len(results)
+
+
+# Parser owned by each worker process (set up by _init_worker)
+_worker_parser: Optional[EmailParser] = None
+
+
+def _init_worker(attachments_dir: Optional[str], max_attachment_size: int):
+    """Create the per-process parser for extraction workers."""
+    global _worker_parser
+    _worker_parser = EmailParser(attachments_dir=attachments_dir, max_attachment_size=max_attachment_size)
 
-        self.parser.print_stats()
-        logger.info(f"Extraction complete. Data saved to {self.output_dir}/")
 
-    def _write_batch(self, batch: List[Dict], batch_num: int):
-        """Write a batch of emails to a JSON file."""
-        output_file = self.output_dir / f"emails_batch_{batch_num:04d}.json"
-        with open(output_file, 'w') as f:
-            json.dump(batch, f, indent=2)
-        logger.info(f"Wrote batch {batch_num} ({len(batch)} emails) to {output_file}")
+def _parse_chunk(chunk: List[Tuple[bytes, str]]) -> Tuple[List[Optional[Dict[str, Any]]], Dict[str, int]]:
+    """Parse a chunk of (content, name) pairs in a worker; returns results and the chunk's stats."""
+    parser = _worker_parser
+    parser.stats = dict.fromkeys(parser.stats, 0)
+    results = [parser.parse_email_file(content, name) for content, name in chunk]
+    # Attachment files must be on disk before the results are reported
+    parser.flush()
+    return results, parser.stats
 
 
 def main():
@@ -542,6 +1017,17 @@ def main():
         default=1000,
         help='Number of emails per output file'
     )
+    arg_parser.add_argument(
+        '--format',
+        choices=['jsonl', 'msgpack'],
+        default='jsonl',
+        help='Batch file format (default: jsonl; msgpack needs the msgpack package)'
+    )
+    arg_parser.add_argument(
+        '--copy-ready',
+        action='store_true',
+        help='Also write each batch\'s messages as a COPY-ready .messages.tsv file for a faster load'
+    )
     arg_parser.add_argument(
         '--extract-attachments',
         action='store_true',
@@ -552,6 +1038,12 @@ def main():
         default='extracted_data/attachments',
         help='Directory for extracted attachments (default: extracted_data/attachments)'
     )
+    arg_parser.add_argument(
+        '-j', '--workers',
+        type=int,
+        default=None,
+        help='Number of parser processes (default: number of CPUs)'
+    )
     arg_parser.add_argument(
         '--max-attachment-size',
         type=int,
@@ -561,6 +1053,9 @@ def main():
 
     args = arg_parser.parse_args()
 
+    if args.format == 'msgpack' and msgpack is None:
+        arg_parser.error("--format msgpack requires the msgpack package")
+
     # Determine attachments_dir based on flags
     attachments_dir = args.attachments_dir if args.extract_attachments else None
 
@@ -570,7 +1065,14 @@ def main():
         attachments_dir=attachments_dir,
         max_attachment_size=args.max_attachment_size
     )
-    extractor.extract_all(limit=args.limit, batch_size=args.batch_size)
+    workers = args.workers or os.cpu_count() or 1
+    extractor.extract_all(
+        limit=args.limit,
+        batch_size=args.batch_size,
+        workers=workers,
+        output_format=args.format,
+        copy_ready=args.copy_ready
+    )
 
 
 if __name__ == '__main__':
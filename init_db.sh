@@ -40,6 +40,12 @@ createdb "$DB_NAME"
 echo "Creating schema..."
 psql -d "$DB_NAME" -f schema.sql
 
+# Apply migrations (all idempotent), so a new database matches a migrated one
+for migration in migrations/*.sql; do
+    echo "Applying $migration..."
+    psql -d "$DB_NAME" -v ON_ERROR_STOP=1 -f "$migration"
+done
+
 echo ""
 echo "✓ Database initialized successfully!"
 echo ""
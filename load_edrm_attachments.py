@@ -9,17 +9,44 @@ This script:
 """
 
 import argparse
+import csv
+import io
 import json
 import os
 import re
 import shutil
 import sys
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Any
 
 import psycopg2
-from psycopg2.extras import execute_batch
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - only needed for .msgpack input
+    msgpack = None
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - JSON arrays are then read whole
+    ijson = None
+
+# Links buffered before they are copied to the database
+BATCH_SIZE = 1000
+
+# Threads placing attachment files (I/O-bound, so they overlap well)
+COPY_THREADS = 8
+
+_ANGLE_RE = re.compile(r'<([^>]+)>')
+_FRACTION_RE = re.compile(r'\.\d+')
+# Leading Re:/Fw:/Fwd: prefixes and whitespace, as normalize_subject() in
+# schema.sql strips them (PostgreSQL's \s is ASCII whitespace only)
+_SUBJECT_PREFIX_RE = re.compile(r'^(?:re:|fwd:|fw:|[ \t\n\r\f\v])+', re.IGNORECASE)
 
 
 def parse_email_from_string(email_str: str) -> Optional[str]:
@@ -27,7 +54,7 @@ def parse_email_from_string(email_str: str) -> Optional[str]:
     if not email_str:
         return None
     # Try to extract from angle brackets
-    match = re.search(r'<([^>]+)>', email_str)
+    match = _ANGLE_RE.search(email_str)
     if match:
         return match.group(1).lower()
     # Fall back to the whole string
@@ -41,19 +68,53 @@ def parse_date(date_str: str) -> Optional[datetime]:
     try:
         # Format: 2001-05-30T16:13:31.0+00:00
         # Remove the .0 milliseconds part if present
-        date_str = re.sub(r'\.\d+', '', date_str)
+        date_str = _FRACTION_RE.sub('', date_str)
         return datetime.fromisoformat(date_str.replace('+00:00', ''))
     except ValueError:
         return None
 
 
+def iter_records(path: str) -> Iterator[dict]:
+    """Stream records from a JSONL file (one object per line), a msgpack stream or a JSON array file."""
+    if path.endswith(".msgpack"):
+        if msgpack is None:
+            raise ImportError(f"The msgpack package is required to read {path}")
+        with open(path, "rb") as f:
+            yield from msgpack.Unpacker(f, raw=False)
+    elif path.endswith(".jsonl"):
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    elif ijson is not None:
+        with open(path, "rb") as f:
+            yield from ijson.items(f, "item", use_float=True)
+    else:
+        with open(path) as f:
+            yield from json.load(f)
+
+
+def link_or_copy(source_path: str, target_path: Path):
+    """Hard-link a file into place, copying it if it is on another filesystem."""
+    try:
+        os.link(source_path, target_path)
+    except OSError:
+        # copyfile uses sendfile() on Linux; file metadata is not needed
+        shutil.copyfile(source_path, target_path)
+
+
 def normalize_subject(subject: str) -> str:
-    """Normalize subject for matching (lowercase, remove Re:/Fw:, trim)."""
+    """
+    Normalize subject for matching (remove leading Re:/Fw:s, trim, lowercase).
+
+    Must give the same result as normalize_subject() in schema.sql, which
+    messages.subject_normalized is generated from.
+    """
     if not subject:
         return ""
-    # Remove Re:, Fw:, Fwd: prefixes
-    subject = re.sub(r'^(Re|Fw|Fwd):\s*', '', subject, flags=re.IGNORECASE)
-    return subject.strip().lower()
+    # Remove Re:, Fw:, Fwd: prefixes; TRIM() only strips spaces
+    subject = _SUBJECT_PREFIX_RE.sub('', subject)
+    return subject.strip(' ').lower()
 
 
 class EDRMLoader:
@@ -91,28 +152,81 @@ class EDRMLoader:
             "attachments_inserted": 0,
             "attachments_linked": 0,
             "attachments_already_exist": 0,
-            "errors": 0,
         }
 
-        # Caches
-        self.attachment_cache: Dict[str, int] = {}  # sha256 -> attachment_id
-        self.email_match_cache: Dict[str, List[int]] = {}  # doc_id -> [message_ids]
+        # Caches (keyed by raw 32-byte digests, half the size of hex strings)
+        self.attachment_cache: Dict[bytes, int] = {}  # sha256 digest -> attachment_id
+        # (from_email, subject, date) -> [message_ids]; EDRM often repeats an email
+        self.email_match_cache: Dict[Tuple[str, str, datetime], List[int]] = {}
+        # (sender email, normalized subject) -> [(date, message_id)], sorted by date
+        self.message_index: Dict[Tuple[str, str], List[Tuple[datetime, int]]] = {}
+
+        # Rows waiting for the next batched INSERT
+        self.pending_attachments: Dict[str, Tuple] = {}  # sha256 -> attachments row
+        self.pending_links: List[Tuple] = []  # (message_id, sha256, filename, order)
+        self.linked_message_ids: Set[int] = set()  # has_attachments set at the end
+
+        # Shard directories already created under the target directory
+        self._created_shards: Set[str] = set()
+
+        # Attachment files are linked/copied in the background
+        self.copy_pool = ThreadPoolExecutor(max_workers=COPY_THREADS)
+        self.pending_copies: List[Future] = []
 
         # Create target directory
         self.target_attachments_dir.mkdir(parents=True, exist_ok=True)
 
     def close(self):
         """Close database connection."""
+        self.copy_pool.shutdown()
         self.cur.close()
         self.conn.close()
 
     def load_existing_attachments(self):
         """Load existing attachments from database into cache."""
-        self.cur.execute("SELECT id, sha256_hash FROM attachments")
-        for row in self.cur:
-            self.attachment_cache[row[1]] = row[0]
+        # Server-side cursor: stream the table instead of buffering it in libpq
+        with self.conn.cursor(name="load_existing_attachments") as cur:
+            cur.itersize = 10000
+            cur.execute("SELECT id, sha256_hash FROM attachments")
+            for attachment_id, sha256_hash in cur:
+                self.attachment_cache[bytes.fromhex(sha256_hash)] = attachment_id
         print(f"Loaded {len(self.attachment_cache)} existing attachments from database")
 
+    def check_schema(self):
+        """Stop with a clear error if the database predates messages.subject_normalized."""
+        self.cur.execute("""
+            SELECT 1 FROM information_schema.columns
+            WHERE table_schema = current_schema()
+            AND table_name = 'messages' AND column_name = 'subject_normalized'
+        """)
+        if self.cur.fetchone() is None:
+            raise SystemExit(
+                "Error: messages.subject_normalized is missing. Apply "
+                "migrations/003_subject_normalized.sql to this database first."
+            )
+
+    def build_message_index(self, from_emails: Set[str]):
+        """
+        Load the candidate messages of the given senders into memory.
+
+        Requires the subject_normalized column (schema.sql, or
+        migrations/003_subject_normalized.sql for older databases).
+        """
+        self.message_index = {}
+        self.email_match_cache = {}
+        self.cur.execute("""
+            SELECT m.date, m.id, LOWER(p.email), m.subject_normalized
+            FROM messages m
+            JOIN people p ON m.from_person_id = p.id
+            WHERE LOWER(p.email) = ANY(%s)
+            AND m.subject_normalized IS NOT NULL
+            AND m.date IS NOT NULL
+            ORDER BY m.date, m.id
+        """, (list(from_emails),))
+        for date, message_id, email, subject_normalized in self.cur:
+            self.message_index.setdefault((email, subject_normalized), []).append((date, message_id))
+        print(f"Indexed {self.cur.rowcount} candidate messages")
+
     def find_matching_messages(
         self,
         subject: str,
@@ -125,37 +239,25 @@ class EDRMLoader:
 
         # Normalize inputs
         from_email = from_email.lower()
-        normalized_subject = normalize_subject(subject)
-
-        # Build query - match by sender, approximate date (within 1 hour), and subject
-        query = """
-            SELECT DISTINCT m.id
-            FROM messages m
-            JOIN people p ON m.from_person_id = p.id
-            WHERE LOWER(p.email) = %s
-            AND m.date BETWEEN %s AND %s
-            AND (
-                LOWER(m.subject) = %s
-                OR LOWER(m.subject) LIKE %s
-            )
-        """
+        cache_key = (from_email, subject, date)
+        cached = self.email_match_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
         # Allow 12 hour window for date matching (timezone differences, PST vs UTC)
         date_start = date - timedelta(hours=12)
         date_end = date + timedelta(hours=12)
 
-        params = (
-            from_email,
-            date_start,
-            date_end,
-            subject.lower() if subject else "",
-            f"%{normalized_subject}%" if normalized_subject else "",
-        )
-
-        self.cur.execute(query, params)
-        return [row[0] for row in self.cur.fetchall()]
+        # Messages from the sender with the same subject once Re:/Fw: prefixes
+        # are stripped (which covers identical subjects), sorted by date
+        candidates = self.message_index.get((from_email, normalize_subject(subject)), [])
+        first = bisect_left(candidates, date_start, key=itemgetter(0))
+        last = bisect_right(candidates, date_end, lo=first, key=itemgetter(0))
+        message_ids = [message_id for _, message_id in candidates[first:last]]
+        self.email_match_cache[cache_key] = message_ids
+        return message_ids
 
-    def get_or_create_attachment(
+    def queue_attachment(
         self,
         sha256_hash: str,
         original_filename: str,
@@ -163,11 +265,17 @@ class EDRMLoader:
         file_size: int,
         source_path: str,
         extension: str
-    ) -> Optional[int]:
-        """Get existing or create new attachment record."""
+    ) -> bool:
+        """
+        Queue an attachment's file copy into storage and its record for insertion.
+
+        Returns False if the attachment is unknown and its source file is
+        missing; the record is inserted by the next flush_attachments(),
+        after the copy has finished.
+        """
         # Check cache
-        if sha256_hash in self.attachment_cache:
-            return self.attachment_cache[sha256_hash]
+        if bytes.fromhex(sha256_hash) in self.attachment_cache or sha256_hash in self.pending_attachments:
+            return True
 
         # Calculate storage path
         shard1 = sha256_hash[:2]
@@ -178,89 +286,175 @@ class EDRMLoader:
 
         # Copy file if not exists
         if not full_target_path.exists():
-            full_target_path.parent.mkdir(parents=True, exist_ok=True)
+            shard = sha256_hash[:4]
+            if shard not in self._created_shards:
+                full_target_path.parent.mkdir(parents=True, exist_ok=True)
+                self._created_shards.add(shard)
             if Path(source_path).exists():
-                shutil.copy2(source_path, full_target_path)
+                self.pending_copies.append(
+                    self.copy_pool.submit(link_or_copy, source_path, full_target_path)
+                )
             else:
                 if self.verbose:
                     print(f"  Source file not found: {source_path}")
-                return None
-
-        # Insert into database
-        try:
-            self.cur.execute("""
-                INSERT INTO attachments (sha256_hash, original_filename, mime_type, file_size, storage_path)
-                VALUES (%s, %s, %s, %s, %s)
-                ON CONFLICT (sha256_hash) DO UPDATE SET sha256_hash = attachments.sha256_hash
-                RETURNING id
-            """, (sha256_hash, original_filename, mime_type, file_size, storage_path))
-
-            attachment_id = self.cur.fetchone()[0]
-            self.attachment_cache[sha256_hash] = attachment_id
-            self.stats["attachments_inserted"] += 1
-            return attachment_id
-
-        except Exception as e:
-            self.stats["errors"] += 1
-            if self.verbose:
-                print(f"  Error inserting attachment: {e}")
-            return None
-
-    def link_attachment_to_message(
+                return False
+
+        self.pending_attachments[sha256_hash] = (
+            sha256_hash, original_filename, mime_type, file_size, storage_path
+        )
+        return True
+
+    def queue_link(
         self,
         message_id: int,
-        attachment_id: int,
+        sha256_hash: str,
         filename: str,
         attachment_order: int
-    ) -> bool:
-        """Create link between message and attachment."""
-        try:
-            self.cur.execute("""
-                INSERT INTO message_attachments (message_id, attachment_id, filename, attachment_order)
-                VALUES (%s, %s, %s, %s)
-                ON CONFLICT (message_id, attachment_id, attachment_order) DO NOTHING
-            """, (message_id, attachment_id, filename, attachment_order))
-            return True
-        except Exception as e:
-            if self.verbose:
-                print(f"  Error linking attachment: {e}")
-            return False
+    ):
+        """Queue a link between a message and an attachment for insertion."""
+        self.pending_links.append((message_id, sha256_hash, filename, attachment_order))
 
-    def update_message_has_attachments(self, message_id: int):
-        """Update the has_attachments flag on a message."""
+    def create_staging_tables(self):
+        """Create the session-local tables that COPY streams rows into."""
         self.cur.execute("""
-            UPDATE messages SET has_attachments = true WHERE id = %s
-        """, (message_id,))
+            CREATE TEMP TABLE IF NOT EXISTS attachments_stage (
+                sha256_hash VARCHAR(64),
+                original_filename VARCHAR(500),
+                mime_type VARCHAR(255),
+                file_size BIGINT,
+                storage_path VARCHAR(500)
+            )
+        """)
+        self.cur.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS message_attachments_stage (
+                message_id INTEGER,
+                attachment_id INTEGER,
+                filename VARCHAR(500),
+                attachment_order INTEGER
+            )
+        """)
+
+    def _copy_rows(self, table: str, rows):
+        """Stream rows into a staging table with a single COPY."""
+        buf = io.StringIO()
+        # Quote every field so empty strings stay '' rather than becoming NULL
+        csv.writer(buf, quoting=csv.QUOTE_ALL).writerows(rows)
+        buf.seek(0)
+        self.cur.copy_expert(f"COPY {table} FROM STDIN WITH CSV", buf)
+
+    def wait_for_copies(self):
+        """Wait for queued file copies, raising the first copy error."""
+        for future in self.pending_copies:
+            future.result()
+        self.pending_copies.clear()
+
+    def flush_attachments(self):
+        """Insert queued attachment records (once their files are in place) and cache their ids."""
+        self.wait_for_copies()
+        if not self.pending_attachments:
+            return
+
+        self._copy_rows("attachments_stage", self.pending_attachments.values())
+        self.cur.execute("""
+            INSERT INTO attachments (sha256_hash, original_filename, mime_type, file_size, storage_path)
+            SELECT sha256_hash, original_filename, mime_type, file_size, storage_path
+            FROM attachments_stage
+            ON CONFLICT (sha256_hash) DO NOTHING
+            RETURNING id, sha256_hash
+        """)
+        rows = self.cur.fetchall()
+        self.cur.execute("TRUNCATE attachments_stage")
+
+        for attachment_id, sha256_hash in rows:
+            self.attachment_cache[bytes.fromhex(sha256_hash)] = attachment_id
+        self.stats["attachments_inserted"] += len(rows)
+
+        # Rows that already existed (added since the cache was loaded) return
+        # nothing; look their ids up rather than rewriting them to get RETURNING
+        existing = [
+            sha256_hash for sha256_hash in self.pending_attachments
+            if bytes.fromhex(sha256_hash) not in self.attachment_cache
+        ]
+        if existing:
+            self.cur.execute(
+                "SELECT id, sha256_hash FROM attachments WHERE sha256_hash = ANY(%s)",
+                (existing,)
+            )
+            for attachment_id, sha256_hash in self.cur:
+                self.attachment_cache[bytes.fromhex(sha256_hash)] = attachment_id
+            self.stats["attachments_already_exist"] += len(existing)
+        self.pending_attachments.clear()
+
+    def flush_links(self):
+        """Insert queued message/attachment links (and the attachments they need)."""
+        self.flush_attachments()
+        if not self.pending_links:
+            return
+
+        rows = [
+            (message_id, self.attachment_cache[bytes.fromhex(sha256_hash)], filename, order)
+            for message_id, sha256_hash, filename, order in self.pending_links
+        ]
+        self._copy_rows("message_attachments_stage", rows)
+        self.cur.execute("""
+            INSERT INTO message_attachments (message_id, attachment_id, filename, attachment_order)
+            SELECT message_id, attachment_id, filename, attachment_order
+            FROM message_attachments_stage
+            ON CONFLICT (message_id, attachment_id, attachment_order) DO NOTHING
+        """)
+        self.cur.execute("TRUNCATE message_attachments_stage")
+
+        self.linked_message_ids.update(row[0] for row in rows)
+        self.stats["attachments_linked"] += len(rows)
+        self.pending_links.clear()
+
+    def update_messages_has_attachments(self):
+        """Set the has_attachments flag on every message that was linked."""
+        if not self.linked_message_ids:
+            return
+        self.cur.execute("""
+            UPDATE messages SET has_attachments = true
+            WHERE id = ANY(%s) AND has_attachments IS NOT TRUE
+        """, (list(self.linked_message_ids),))
 
     def load(self, emails_json: str, attachments_json: str):
         """Load EDRM data into the database."""
+        self.check_schema()
         print(f"Loading EDRM data...")
 
-        # Load JSON files
-        with open(emails_json) as f:
-            emails = json.load(f)
-        with open(attachments_json) as f:
-            attachments = json.load(f)
+        # Stream the input files, keeping only the emails with attachments
+        email_count = 0
+        emails = []
+        for email in iter_records(emails_json):
+            email_count += 1
+            if email.get("has_attachments"):
+                emails.append(email)
+
+        # Build attachment lookup by parent_doc_id, for those emails only
+        wanted = {email["doc_id"] for email in emails}
+        attachment_count = 0
+        attachments_by_parent: Dict[str, List[dict]] = defaultdict(list)
+        for att in iter_records(attachments_json):
+            attachment_count += 1
+            parent = att.get("parent_doc_id")
+            if parent in wanted:
+                attachments_by_parent[parent].append(att)
 
-        print(f"  {len(emails)} emails, {len(attachments)} attachments")
+        print(f"  {email_count} emails, {attachment_count} attachments")
 
         # Load existing attachments
         self.load_existing_attachments()
+        self.create_staging_tables()
 
-        # Build attachment lookup by parent_doc_id
-        attachments_by_parent: Dict[str, List[dict]] = {}
-        for att in attachments:
-            parent = att.get("parent_doc_id", "")
-            if parent:
-                if parent not in attachments_by_parent:
-                    attachments_by_parent[parent] = []
-                attachments_by_parent[parent].append(att)
+        # Load the messages of every sender we may need to match
+        self.build_message_index({
+            from_email
+            for email in emails
+            if (from_email := parse_email_from_string(email.get("from_addr", "")))
+        })
 
         # Process emails with attachments
         for email in emails:
-            if not email.get("has_attachments"):
-                continue
-
             self.stats["emails_processed"] += 1
 
             # Parse email data
@@ -293,36 +487,36 @@ class EDRMLoader:
                 sha256_hash = att.get("sha256_hash", "")
                 if not sha256_hash:
                     continue
+                filename = att.get("filename", "")
 
-                attachment_id = self.get_or_create_attachment(
+                if not self.queue_attachment(
                     sha256_hash=sha256_hash,
-                    original_filename=att.get("filename", ""),
+                    original_filename=filename,
                     mime_type=att.get("mime_type", "application/octet-stream"),
                     file_size=att.get("file_size", 0),
                     source_path=att.get("storage_path", ""),
                     extension=att.get("extension", "")
-                )
-
-                if not attachment_id:
+                ):
                     continue
 
                 # Link to all matching messages
                 for message_id in message_ids:
-                    if self.link_attachment_to_message(
+                    self.queue_link(
                         message_id=message_id,
-                        attachment_id=attachment_id,
-                        filename=att.get("filename", ""),
+                        sha256_hash=sha256_hash,
+                        filename=filename,
                         attachment_order=order
-                    ):
-                        self.stats["attachments_linked"] += 1
-                        self.update_message_has_attachments(message_id)
+                    )
+
+            if len(self.pending_links) >= BATCH_SIZE:
+                self.flush_links()
 
-            # Commit periodically
             if self.stats["emails_processed"] % 100 == 0:
-                self.conn.commit()
                 print(f"  Processed {self.stats['emails_processed']} emails...")
 
-        # Final commit
+        # Single commit: every insert is idempotent, so a failed load is simply rerun
+        self.flush_links()
+        self.update_messages_has_attachments()
         self.conn.commit()
         print("Done!")
 
@@ -337,7 +531,6 @@ class EDRMLoader:
         print(f"Attachments processed:  {self.stats['attachments_processed']:,}")
         print(f"Attachments inserted:   {self.stats['attachments_inserted']:,}")
         print(f"Attachments linked:     {self.stats['attachments_linked']:,}")
-        print(f"Errors:                 {self.stats['errors']:,}")
         print("=" * 60)
 
 
@@ -347,13 +540,13 @@ def main():
     )
     parser.add_argument(
         "--emails-json",
-        default="extracted_edrm_data/edrm_emails.json",
-        help="Path to extracted emails JSON"
+        default="extracted_edrm_data/edrm_emails.jsonl",
+        help="Path to extracted emails JSONL (or .msgpack, or JSON array)"
     )
     parser.add_argument(
         "--attachments-json",
-        default="extracted_edrm_data/edrm_attachments.json",
-        help="Path to extracted attachments JSON"
+        default="extracted_edrm_data/edrm_attachments.jsonl",
+        help="Path to extracted attachments JSONL (or .msgpack, or JSON array)"
     )
     parser.add_argument(
         "--attachments-dir",
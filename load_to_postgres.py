@@ -6,15 +6,31 @@ Reads JSON files from the extraction output and loads them into the
 normalized PostgreSQL schema for graph analysis.
 """
 
+import io
 import json
 import logging
+import multiprocessing.util
 import psycopg2
-from psycopg2.extras import execute_batch
+from collections import OrderedDict
+from psycopg2.extras import execute_values
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 import argparse
 import os
+import sys
 from dotenv import load_dotenv
+from extract_emails import _copy_field
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - fall back to the stdlib decoder
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - only needed for .msgpack batches
+    msgpack = None
 
 # Load environment variables
 load_dotenv()
@@ -25,6 +41,80 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Tables written by load_batch; --bulk drops their secondary indexes meanwhile
+LOAD_TABLES = (
+    'people', 'messages', 'message_recipients', 'message_references',
+    'attachments', 'message_attachments',
+)
+
+# Columns COPYed into messages, in row order
+MESSAGE_COLUMNS = (
+    'message_id', 'from_person_id', 'subject', 'body', 'date', 'timestamp',
+    'in_reply_to', 'mailbox_owner', 'folder_name', 'file_path',
+    'x_from', 'x_to', 'x_cc', 'x_bcc', 'x_folder', 'x_origin', 'x_filename',
+    'has_attachments',
+)
+# Columns of the extractor's --copy-ready .messages.tsv sidecars: the sender
+# address, then the messages columns other than from_person_id
+SIDECAR_COLUMNS = ('from_email',) + tuple(c for c in MESSAGE_COLUMNS if c != 'from_person_id')
+RECIPIENT_COLUMNS = ('message_id', 'person_id', 'recipient_type')
+REFERENCE_COLUMNS = ('message_id', 'referenced_message_id', 'reference_order')
+ATTACHMENT_REF_COLUMNS = ('message_id', 'attachment_id', 'filename', 'content_id', 'attachment_order')
+
+# Entries kept in each of the people/attachment ID caches; older ones are
+# looked up again if a later batch needs them. Must exceed the distinct
+# addresses (and hashes) of any one batch, which stay cached while it loads
+CACHE_SIZE = 200_000
+
+# Characters of COPY data buffered by _copy_rows before they are sent
+COPY_BUFFER_SIZE = 8 * 1024 * 1024
+
+def _normalize_email(email: Optional[str]) -> Optional[str]:
+    """Normalize an address to its people.email form (None if missing)."""
+    if not email:
+        return None
+    return email.lower().strip()
+
+
+def _copy_rows(cur, table: str, columns, rows: List[tuple]):
+    """
+    Stream rows into a table with COPY ... FROM STDIN.
+
+    Rows are sent whenever COPY_BUFFER_SIZE characters have been buffered,
+    so a batch of long bodies never sits in memory as one huge string.
+    """
+    sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN"
+    buf = io.StringIO()
+    for row in rows:
+        buf.write('\t'.join(map(_copy_field, row)))
+        buf.write('\n')
+        if buf.tell() >= COPY_BUFFER_SIZE:
+            buf.seek(0)
+            cur.copy_expert(sql, buf)
+            buf = io.StringIO()
+    if buf.tell():
+        buf.seek(0)
+        cur.copy_expert(sql, buf)
+
+
+class _LRUCache(OrderedDict):
+    """Dict that drops its least recently used entries beyond maxsize."""
+
+    def __init__(self, maxsize: int):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+
 
 class PostgresLoader:
     """Loads extracted email data into PostgreSQL."""
@@ -37,8 +127,9 @@ class PostgresLoader:
         self.db_port = db_port or int(os.getenv('POSTGRES_PORT', '5432'))
         self.db_password = db_password or os.getenv('POSTGRES_PASSWORD')
         self.conn = None
-        self.people_cache: Dict[str, int] = {}  # email -> person_id
-        self.attachment_cache: Dict[str, int] = {}  # sha256_hash -> attachment_id
+        self.people_cache: Dict[str, int] = _LRUCache(CACHE_SIZE)  # email -> person_id
+        self.dropped_indexes: List[str] = []  # definitions to recreate after --bulk
+        self.attachment_cache: Dict[str, int] = _LRUCache(CACHE_SIZE)  # sha256_hash -> attachment_id
 
         self.stats = {
             'people': 0,
@@ -50,6 +141,8 @@ class PostgresLoader:
             'attachment_refs': 0,
             'attachments_deduplicated': 0,
         }
+        # Batch files that failed to load (rolled back and skipped)
+        self.failed_batches: List[Path] = []
 
     def connect(self):
         """Connect to PostgreSQL database."""
@@ -66,96 +159,119 @@ class PostgresLoader:
             logger.error(f"Failed to connect to database: {e}")
             raise
 
+    def create_staging_tables(self):
+        """
+        Create the temporary tables that the current batch is COPYed into.
+
+        Rows that need ON CONFLICT handling or RETURNING go through these
+        and are merged with INSERT ... SELECT. They are dropped on commit,
+        so nothing outlives the transaction and the loader also works
+        through a transaction-pooling PgBouncer.
+        """
+        cur = self.conn.cursor()
+        for table, columns in (
+            ('messages', MESSAGE_COLUMNS),
+            ('message_recipients', RECIPIENT_COLUMNS),
+            ('message_attachments', ATTACHMENT_REF_COLUMNS),
+        ):
+            cur.execute(f"""
+                CREATE TEMP TABLE {table}_stage ON COMMIT DROP AS
+                SELECT {', '.join(columns)} FROM {table} WITH NO DATA
+            """)
+        cur.close()
+
     def close(self):
         """Close database connection."""
         if self.conn:
             self.conn.close()
             logger.info("Database connection closed")
 
-    def get_or_create_person(self, email: str, name: str = None) -> int:
+    def create_people(self, emails: List[Dict]):
         """
-        Get person ID by email, creating if not exists.
+        Cache the person ID of every address in a batch, creating new people.
 
-        Args:
-            email: Email address
-            name: Person's name (optional)
+        New people are inserted with one multi-row INSERT, keeping the name
+        from each address's first occurrence in the batch; people that
+        already exist are looked up with a single SELECT.
 
-        Returns:
-            Person ID
+        Args:
+            emails: Email records of the batch
         """
-        if not email:
-            return None
-
-        email = email.lower().strip()
-
-        # Check cache
-        if email in self.people_cache:
-            return self.people_cache[email]
+        new_people: Dict[str, Optional[str]] = {}
+        for email_data in emails:
+            addresses = [(email_data.get('from_address'), email_data.get('from_name'))]
+            for field in ('to_addresses', 'cc_addresses', 'bcc_addresses'):
+                addresses.extend(
+                    (recipient.get('address'), recipient.get('name'))
+                    for recipient in email_data.get(field, [])
+                )
+            for email, name in addresses:
+                email = _normalize_email(email)
+                if email is None:
+                    continue
+                if email in self.people_cache:
+                    # Keep it cached while the new people are added
+                    self.people_cache.move_to_end(email)
+                else:
+                    new_people.setdefault(email, name if name else None)
+
+        if not new_people:
+            return
 
         cur = self.conn.cursor()
-
-        # Try to get existing
-        cur.execute("SELECT id FROM people WHERE email = %s", (email,))
-        row = cur.fetchone()
-
-        if row:
-            person_id = row[0]
-        else:
-            # Insert new person
-            cur.execute(
-                """
-                INSERT INTO people (email, name)
-                VALUES (%s, %s)
-                RETURNING id
-                """,
-                (email, name if name else None)
-            )
-            person_id = cur.fetchone()[0]
-            self.stats['people'] += 1
-
+        created = execute_values(
+            cur,
+            """
+            INSERT INTO people (email, name)
+            VALUES %s
+            ON CONFLICT (email) DO NOTHING
+            RETURNING email, id
+            """,
+            # Sorted so concurrent loaders lock rows in the same order
+            sorted(new_people.items()),
+            page_size=1000,
+            fetch=True
+        )
+        self.people_cache.update(created)
+        self.stats['people'] += len(created)
+
+        existing = [email for email in new_people if email not in self.people_cache]
+        if existing:
+            cur.execute("SELECT email, id FROM people WHERE email = ANY(%s)", (existing,))
+            self.people_cache.update(cur.fetchall())
         cur.close()
-        self.people_cache[email] = person_id
-        return person_id
-
-    def get_or_create_attachment(self, attachment_data: Dict) -> int:
-        """
-        Get attachment ID by SHA256 hash, creating if not exists.
 
-        Args:
-            attachment_data: Dict with sha256_hash, original_filename, mime_type, etc.
+    def person_id(self, email: Optional[str]) -> Optional[int]:
+        """Return the cached person ID for an address (see create_people)."""
+        email = _normalize_email(email)
+        return None if email is None else self.people_cache[email]
 
-        Returns:
-            Attachment ID
+    def create_attachments(self, emails: List[Dict]):
         """
-        sha256_hash = attachment_data.get('sha256_hash')
-        if not sha256_hash:
-            return None
+        Cache the attachment ID of every attachment in a batch, creating new ones.
 
-        # Check cache
-        if sha256_hash in self.attachment_cache:
-            self.stats['attachments_deduplicated'] += 1
-            return self.attachment_cache[sha256_hash]
+        Attachments are deduplicated by SHA256 hash: new hashes are inserted
+        with one multi-row INSERT (metadata from their first occurrence) and
+        hashes already in the database are looked up with a single SELECT.
 
-        cur = self.conn.cursor()
-
-        # Try to get existing
-        cur.execute("SELECT id FROM attachments WHERE sha256_hash = %s", (sha256_hash,))
-        row = cur.fetchone()
-
-        if row:
-            attachment_id = row[0]
-            self.stats['attachments_deduplicated'] += 1
-        else:
-            # Insert new attachment
-            cur.execute(
-                """
-                INSERT INTO attachments (
-                    sha256_hash, original_filename, mime_type,
-                    file_size, storage_path, is_inline
-                ) VALUES (%s, %s, %s, %s, %s, %s)
-                RETURNING id
-                """,
-                (
+        Args:
+            emails: Email records of the batch
+        """
+        new_attachments: Dict[str, tuple] = {}
+        deduplicated = 0
+        for email_data in emails:
+            for attachment_data in email_data.get('attachments', []):
+                sha256_hash = attachment_data.get('sha256_hash')
+                if not sha256_hash:
+                    continue
+                if sha256_hash in self.attachment_cache:
+                    self.attachment_cache.move_to_end(sha256_hash)
+                    deduplicated += 1
+                    continue
+                if sha256_hash in new_attachments:
+                    deduplicated += 1
+                    continue
+                new_attachments[sha256_hash] = (
                     sha256_hash,
                     attachment_data.get('original_filename'),
                     attachment_data.get('mime_type'),
@@ -163,184 +279,322 @@ class PostgresLoader:
                     attachment_data.get('storage_path'),
                     attachment_data.get('is_inline', False)
                 )
-            )
-            attachment_id = cur.fetchone()[0]
-            self.stats['attachments'] += 1
+        self.stats['attachments_deduplicated'] += deduplicated
 
+        if not new_attachments:
+            return
+
+        cur = self.conn.cursor()
+        created = execute_values(
+            cur,
+            """
+            INSERT INTO attachments (
+                sha256_hash, original_filename, mime_type,
+                file_size, storage_path, is_inline
+            ) VALUES %s
+            ON CONFLICT (sha256_hash) DO NOTHING
+            RETURNING sha256_hash, id
+            """,
+            sorted(new_attachments.values()),
+            page_size=1000,
+            fetch=True
+        )
+        self.attachment_cache.update(created)
+        self.stats['attachments'] += len(created)
+
+        existing = [h for h in new_attachments if h not in self.attachment_cache]
+        if existing:
+            cur.execute(
+                "SELECT sha256_hash, id FROM attachments WHERE sha256_hash = ANY(%s)",
+                (existing,)
+            )
+            self.attachment_cache.update(cur.fetchall())
+            self.stats['attachments_deduplicated'] += len(existing)
         cur.close()
-        self.attachment_cache[sha256_hash] = attachment_id
-        return attachment_id
 
     def load_batch(self, batch_file: Path):
         """
-        Load a batch of emails from a JSON file.
+        Load a batch of emails from a JSON file in a single transaction.
+
+        If the batch was extracted with --copy-ready, its records are marked
+        'copy_ready' and carry no body, and the messages rows are streamed as
+        is from the .messages.tsv sidecar next to it. An unmarked batch is
+        loaded from its records alone, whatever sidecar file is lying around.
 
         Args:
-            batch_file: Path to batch JSON file
+            batch_file: Path to batch JSON (array), JSONL (one email per line)
+                or msgpack (stream of emails) file
         """
         logger.info(f"Loading batch: {batch_file}")
 
-        with open(batch_file, 'r') as f:
-            emails = json.load(f)
+        if batch_file.suffix == '.msgpack':
+            if msgpack is None:
+                raise ImportError(f"The msgpack package is required to read {batch_file}")
+            with open(batch_file, 'rb') as f:
+                emails = list(msgpack.Unpacker(f, raw=False))
+        else:
+            loads = orjson.loads if orjson is not None else json.loads
+            with open(batch_file, 'rb') as f:
+                if batch_file.suffix == '.jsonl':
+                    emails = [loads(line) for line in f if line.strip()]
+                else:
+                    emails = loads(f.read())
+
+        copy_ready = sum(1 for email_data in emails if email_data.get('copy_ready'))
+        if not copy_ready:
+            messages_tsv = None
+        elif copy_ready != len(emails):
+            raise ValueError(f"{batch_file}: only {copy_ready} of {len(emails)} records are marked copy_ready")
+        else:
+            messages_tsv = batch_file.with_suffix('.messages.tsv')
+            if not messages_tsv.exists():
+                raise FileNotFoundError(
+                    f"{batch_file} was extracted with --copy-ready, so its records have no body, "
+                    f"but its sidecar {messages_tsv} is missing"
+                )
 
+        # One transaction per batch: it commits on success and rolls back
+        # on error, so no partial batch is left behind
+        stats_before = dict(self.stats)
+        try:
+            with self.conn:
+                self.create_staging_tables()
+                self._insert_emails(emails, messages_tsv)
+        except Exception:
+            # IDs cached by the rolled-back transaction no longer exist, and
+            # nothing it counted was loaded
+            self.people_cache.clear()
+            self.attachment_cache.clear()
+            self.stats.update(stats_before)
+            raise
+        self.stats['batches'] += 1
+
+        logger.info(f"Batch complete. Progress: {self.stats['messages']:,} messages, "
+                   f"{self.stats['people']:,} people")
+
+    def _insert_emails(self, emails: List[Dict], messages_tsv: Optional[Path] = None):
+        """
+        Insert a batch's emails in the current transaction.
+
+        Rows are COPYed in bulk; messages already in the database (or
+        repeated within the batch) are skipped. The messages rows are read
+        from the messages_tsv sidecar if given, else built from the records.
+        """
+        record_count = len(emails)
+
+        # Drop messages that are already loaded up front, so their people
+        # and attachments aren't resolved for nothing
         cur = self.conn.cursor()
+        cur.execute(
+            "SELECT message_id FROM messages WHERE message_id = ANY(%s)",
+            ([email_data['message_id'] for email_data in emails],)
+        )
+        existing = {row[0] for row in cur.fetchall()}
+        cur.close()
+        if existing:
+            logger.debug(f"Skipping {len(existing)} messages already in the database")
+            emails = [email_data for email_data in emails if email_data['message_id'] not in existing]
+
+        self.create_people(emails)
+        self.create_attachments(emails)
+
+        message_rows = []
+        dependents = []  # (message_id, recipient rows, references, attachment rows)
+        seen: Set[str] = set()
 
         for email_data in emails:
-            try:
-                # Get or create sender
-                from_person_id = self.get_or_create_person(
-                    email_data.get('from_address'),
-                    email_data.get('from_name')
-                )
+            message_id = email_data['message_id']
+            if message_id in seen:
+                logger.debug(f"Skipping duplicate: {message_id}")
+                continue
+            seen.add(message_id)
+
+            attachments = email_data.get('attachments', [])
 
+            # A sidecar already holds the messages rows
+            if messages_tsv is None:
                 # Check if message has attachments
-                attachments = email_data.get('attachments', [])
                 has_attachments = len(attachments) > 0
 
-                # Insert message
-                cur.execute(
-                    """
-                    INSERT INTO messages (
-                        message_id, from_person_id, subject, body, date, timestamp,
-                        in_reply_to, mailbox_owner, folder_name, file_path,
-                        x_from, x_to, x_cc, x_bcc, x_folder, x_origin, x_filename,
-                        has_attachments
-                    ) VALUES (
-                        %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
-                    )
-                    RETURNING id
-                    """,
-                    (
-                        email_data['message_id'],
-                        from_person_id,
-                        email_data.get('subject'),
-                        email_data.get('body'),
-                        email_data.get('date'),
-                        email_data.get('timestamp'),
-                        email_data.get('in_reply_to'),
-                        email_data.get('mailbox_owner'),
-                        email_data.get('folder_name'),
-                        email_data.get('file_path'),
-                        email_data.get('x_from'),
-                        email_data.get('x_to'),
-                        email_data.get('x_cc'),
-                        email_data.get('x_bcc'),
-                        email_data.get('x_folder'),
-                        email_data.get('x_origin'),
-                        email_data.get('x_filename'),
-                        has_attachments
-                    )
-                )
-                message_db_id = cur.fetchone()[0]
-                self.stats['messages'] += 1
-
-                # Insert recipients (to)
-                for recipient in email_data.get('to_addresses', []):
-                    person_id = self.get_or_create_person(
-                        recipient.get('address'),
-                        recipient.get('name')
-                    )
-                    if person_id:
-                        cur.execute(
-                            """
-                            INSERT INTO message_recipients (message_id, person_id, recipient_type)
-                            VALUES (%s, %s, 'to')
-                            ON CONFLICT (message_id, person_id, recipient_type) DO NOTHING
-                            """,
-                            (message_db_id, person_id)
-                        )
-                        self.stats['recipients'] += 1
-
-                # Insert recipients (cc)
-                for recipient in email_data.get('cc_addresses', []):
-                    person_id = self.get_or_create_person(
-                        recipient.get('address'),
-                        recipient.get('name')
-                    )
-                    if person_id:
-                        cur.execute(
-                            """
-                            INSERT INTO message_recipients (message_id, person_id, recipient_type)
-                            VALUES (%s, %s, 'cc')
-                            ON CONFLICT (message_id, person_id, recipient_type) DO NOTHING
-                            """,
-                            (message_db_id, person_id)
-                        )
-                        self.stats['recipients'] += 1
-
-                # Insert recipients (bcc)
-                for recipient in email_data.get('bcc_addresses', []):
-                    person_id = self.get_or_create_person(
-                        recipient.get('address'),
-                        recipient.get('name')
-                    )
+                from_person_id = self.person_id(email_data.get('from_address'))
+
+                message_rows.append((
+                    message_id,
+                    from_person_id,
+                    email_data.get('subject'),
+                    email_data.get('body'),
+                    email_data.get('date'),
+                    email_data.get('timestamp'),
+                    email_data.get('in_reply_to'),
+                    email_data.get('mailbox_owner'),
+                    email_data.get('folder_name'),
+                    email_data.get('file_path'),
+                    email_data.get('x_from'),
+                    email_data.get('x_to'),
+                    email_data.get('x_cc'),
+                    email_data.get('x_bcc'),
+                    email_data.get('x_folder'),
+                    email_data.get('x_origin'),
+                    email_data.get('x_filename'),
+                    has_attachments
+                ))
+
+            # Recipients (to, cc, bcc)
+            recipients = []
+            for recipient_type in ('to', 'cc', 'bcc'):
+                for recipient in email_data.get(f'{recipient_type}_addresses', []):
+                    person_id = self.person_id(recipient.get('address'))
                     if person_id:
-                        cur.execute(
-                            """
-                            INSERT INTO message_recipients (message_id, person_id, recipient_type)
-                            VALUES (%s, %s, 'bcc')
-                            ON CONFLICT (message_id, person_id, recipient_type) DO NOTHING
-                            """,
-                            (message_db_id, person_id)
-                        )
-                        self.stats['recipients'] += 1
-
-                # Insert references
-                for idx, ref_msg_id in enumerate(email_data.get('references', [])):
-                    cur.execute(
-                        """
-                        INSERT INTO message_references (message_id, referenced_message_id, reference_order)
-                        VALUES (%s, %s, %s)
-                        """,
-                        (message_db_id, ref_msg_id, idx)
-                    )
-                    self.stats['references'] += 1
-
-                # Insert attachments
-                for att_data in attachments:
-                    attachment_id = self.get_or_create_attachment(att_data)
-                    if attachment_id:
-                        cur.execute(
-                            """
-                            INSERT INTO message_attachments (
-                                message_id, attachment_id, filename,
-                                content_id, attachment_order
-                            ) VALUES (%s, %s, %s, %s, %s)
-                            ON CONFLICT (message_id, attachment_id, attachment_order) DO NOTHING
-                            """,
-                            (
-                                message_db_id,
-                                attachment_id,
-                                att_data.get('original_filename'),
-                                att_data.get('content_id'),
-                                att_data.get('attachment_order', 0)
-                            )
-                        )
-                        self.stats['attachment_refs'] += 1
-
-            except psycopg2.IntegrityError as e:
-                # Duplicate message_id, skip
-                logger.debug(f"Skipping duplicate: {email_data.get('message_id')}")
-                self.conn.rollback()
-                continue
-            except Exception as e:
-                logger.error(f"Error loading email {email_data.get('message_id')}: {e}")
-                self.conn.rollback()
+                        recipients.append((person_id, recipient_type))
+
+            # Attachments
+            attachment_refs = []
+            for att_data in attachments:
+                attachment_id = self.attachment_cache.get(att_data.get('sha256_hash'))
+                if attachment_id:
+                    attachment_refs.append((
+                        attachment_id,
+                        att_data.get('original_filename'),
+                        att_data.get('content_id'),
+                        att_data.get('attachment_order', 0)
+                    ))
+
+            dependents.append((
+                message_id, recipients, email_data.get('references', []), attachment_refs
+            ))
+
+        cur = self.conn.cursor()
+
+        # Insert messages, skipping any already in the database
+        columns = ', '.join(MESSAGE_COLUMNS)
+        if messages_tsv is None:
+            _copy_rows(cur, 'messages_stage', MESSAGE_COLUMNS, message_rows)
+            source = f"SELECT {columns} FROM messages_stage ORDER BY message_id"
+        else:
+            cur.execute(f"""
+                CREATE TEMP TABLE messages_sidecar_stage ON COMMIT DROP AS
+                SELECT NULL::text as from_email, {', '.join(SIDECAR_COLUMNS[1:])}
+                FROM messages WITH NO DATA
+            """)
+            with open(messages_tsv, 'rb') as f:
+                cur.copy_expert(
+                    f"COPY messages_sidecar_stage ({', '.join(SIDECAR_COLUMNS)}) "
+                    "FROM STDIN WITH (ENCODING 'UTF8')",
+                    f
+                )
+            # The sidecar must hold exactly this batch's rows
+            if cur.rowcount != record_count:
+                raise ValueError(
+                    f"{messages_tsv} holds {cur.rowcount} messages rows, "
+                    f"but its batch has {record_count} records"
+                )
+            # Senders were created by create_people; ctid is file order, so
+            # the first copy of a repeated message is the one inserted
+            selected = ', '.join('p.id' if c == 'from_person_id' else f's.{c}' for c in MESSAGE_COLUMNS)
+            source = f"""
+                SELECT {selected}
+                FROM messages_sidecar_stage s
+                LEFT JOIN people p ON p.email = s.from_email
+                ORDER BY s.message_id, s.ctid
+            """
+        cur.execute(f"""
+            INSERT INTO messages ({columns})
+            {source}
+            ON CONFLICT (message_id) DO NOTHING
+            RETURNING message_id, id
+        """)
+        message_db_ids = dict(cur.fetchall())
+
+        # Rows referencing the inserted messages
+        recipient_rows = []
+        reference_rows = []
+        attachment_ref_rows = []
+        for message_id, recipients, references, attachment_refs in dependents:
+            message_db_id = message_db_ids.get(message_id)
+            if message_db_id is None:
+                logger.debug(f"Skipping duplicate: {message_id}")
                 continue
+            recipient_rows.extend((message_db_id, *recipient) for recipient in recipients)
+            reference_rows.extend(
+                (message_db_id, ref_msg_id, idx) for idx, ref_msg_id in enumerate(references)
+            )
+            attachment_ref_rows.extend((message_db_id, *ref) for ref in attachment_refs)
+
+        _copy_rows(cur, 'message_recipients_stage', RECIPIENT_COLUMNS, recipient_rows)
+        cur.execute("""
+            INSERT INTO message_recipients (message_id, person_id, recipient_type)
+            SELECT message_id, person_id, recipient_type FROM message_recipients_stage
+            ON CONFLICT (message_id, person_id, recipient_type) DO NOTHING
+        """)
+
+        _copy_rows(cur, 'message_references', REFERENCE_COLUMNS, reference_rows)
+
+        _copy_rows(cur, 'message_attachments_stage', ATTACHMENT_REF_COLUMNS, attachment_ref_rows)
+        cur.execute("""
+            INSERT INTO message_attachments (
+                message_id, attachment_id, filename, content_id, attachment_order
+            )
+            SELECT message_id, attachment_id, filename, content_id, attachment_order
+            FROM message_attachments_stage
+            ON CONFLICT (message_id, attachment_id, attachment_order) DO NOTHING
+        """)
 
+        cur.close()
+        self.stats['messages'] += len(message_db_ids)
+        self.stats['recipients'] += len(recipient_rows)
+        self.stats['references'] += len(reference_rows)
+        self.stats['attachment_refs'] += len(attachment_ref_rows)
+
+    def prepare_bulk_load(self):
+        """
+        Drop the secondary indexes of the loaded tables before a bulk load.
+
+        Unique and primary key indexes stay, as ON CONFLICT needs them.
+        Building the others once after the load is much cheaper than
+        maintaining them row by row; finalize_bulk_load() recreates them.
+        """
+        cur = self.conn.cursor()
+        cur.execute("""
+            SELECT i.indexrelid::regclass::text, pg_get_indexdef(i.indexrelid)
+            FROM pg_index i
+            WHERE i.indrelid::regclass::text = ANY(%s)
+            AND NOT i.indisunique
+            AND NOT i.indisprimary
+        """, (list(LOAD_TABLES),))
+        for index_name, definition in cur.fetchall():
+            # Logged so the index can be recreated by hand if the load dies
+            logger.info(f"Dropping index for bulk load: {definition}")
+            cur.execute(f"DROP INDEX {index_name}")
+            self.dropped_indexes.append(definition)
         cur.close()
         self.conn.commit()
-        self.stats['batches'] += 1
 
-        logger.info(f"Batch complete. Progress: {self.stats['messages']:,} messages, "
-                   f"{self.stats['people']:,} people")
+    def finalize_bulk_load(self):
+        """Recreate the indexes dropped by prepare_bulk_load() and refresh statistics."""
+        if not self.dropped_indexes:
+            return
 
-    def load_all_batches(self, data_dir: str = "extracted_data"):
+        logger.info(f"Recreating {len(self.dropped_indexes)} indexes...")
+        cur = self.conn.cursor()
+        for definition in self.dropped_indexes:
+            cur.execute(definition)
+        for table in LOAD_TABLES:
+            cur.execute(f"ANALYZE {table}")
+        cur.close()
+        self.conn.commit()
+        self.dropped_indexes.clear()
+
+    def load_all_batches(self, data_dir: str = "extracted_data", workers: int = 1):
         """
         Load all batch files from the extraction directory.
 
+        A batch that fails to load is rolled back, logged and recorded in
+        failed_batches, and the remaining batches are still loaded.
+
         Args:
-            data_dir: Directory containing batch JSON files
+            data_dir: Directory containing batch JSON/JSONL/msgpack files
+            workers: Number of loader processes, each with its own connection
+                (1 loads in this process)
         """
         data_path = Path(data_dir)
 
@@ -348,7 +602,11 @@ class PostgresLoader:
             logger.error(f"Data directory not found: {data_dir}")
             return
 
-        batch_files = sorted(data_path.glob("emails_batch_*.json"))
+        batch_files = sorted(
+            list(data_path.glob("emails_batch_*.jsonl"))
+            + list(data_path.glob("emails_batch_*.msgpack"))
+            + list(data_path.glob("emails_batch_*.json"))
+        )
 
         if not batch_files:
             logger.error(f"No batch files found in {data_dir}")
@@ -356,10 +614,43 @@ class PostgresLoader:
 
         logger.info(f"Found {len(batch_files)} batch files")
 
-        for batch_file in batch_files:
-            self.load_batch(batch_file)
+        if workers > 1:
+            logger.info(f"Loading with {workers} worker processes")
+            self._load_parallel(batch_files, workers)
+        else:
+            for batch_file in batch_files:
+                try:
+                    self.load_batch(batch_file)
+                except Exception as e:
+                    logger.error(f"Failed to load batch {batch_file}: {e}")
+                    self.failed_batches.append(batch_file)
+
+        if self.failed_batches:
+            logger.error(f"{len(self.failed_batches)} of {len(batch_files)} batches failed to load")
+        else:
+            logger.info("All batches loaded!")
+
+    def _load_parallel(self, batch_files: List[Path], workers: int):
+        """
+        Load batch files concurrently in worker processes.
 
-        logger.info("All batches loaded!")
+        Batches are independent: people, attachments and messages are
+        inserted with ON CONFLICT, so Postgres's unique indexes settle
+        workers racing on the same row. Each worker keeps its own caches.
+        """
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.db_name, self.db_user, self.db_host, self.db_port, self.db_password),
+        ) as executor:
+            for batch_file, (stats, error) in zip(batch_files, executor.map(_load_batch_file, batch_files)):
+                if error is not None:
+                    logger.error(f"Failed to load batch {batch_file}: {error}")
+                    self.failed_batches.append(batch_file)
+                for key, value in stats.items():
+                    self.stats[key] += value
+                logger.info(f"Progress: {self.stats['batches']}/{len(batch_files)} batches, "
+                            f"{self.stats['messages']:,} messages, {self.stats['people']:,} people")
 
     def build_threads(self):
         """
@@ -370,17 +661,31 @@ class PostgresLoader:
 
         cur = self.conn.cursor()
 
-        # Strategy 1: Group by normalized subject
+        # The stored messages.subject_normalized column, or on databases that
+        # predate it, the normalize_subject() expression it is generated from
         cur.execute("""
+            SELECT 1 FROM information_schema.columns
+            WHERE table_schema = current_schema()
+            AND table_name = 'messages' AND column_name = 'subject_normalized'
+        """)
+        if cur.fetchone():
+            subject_normalized = 'm.subject_normalized'
+        else:
+            logger.warning("messages.subject_normalized is missing (see migrations/003_subject_normalized.sql); "
+                           "normalizing subjects inline")
+            subject_normalized = 'normalize_subject(m.subject)'
+
+        # Strategy 1: Group by normalized subject
+        cur.execute(f"""
             INSERT INTO threads (subject_normalized, message_count, start_date, end_date)
             SELECT
-                normalize_subject(subject) as subj_norm,
+                {subject_normalized} as subj_norm,
                 COUNT(*) as msg_count,
-                MIN(date) as start_date,
-                MAX(date) as end_date
-            FROM messages
-            WHERE subject IS NOT NULL AND subject != ''
-            GROUP BY normalize_subject(subject)
+                MIN(m.date) as start_date,
+                MAX(m.date) as end_date
+            FROM messages m
+            WHERE m.subject IS NOT NULL AND m.subject != ''
+            GROUP BY subj_norm
             HAVING COUNT(*) >= 1
             ON CONFLICT DO NOTHING
         """)
@@ -389,38 +694,49 @@ class PostgresLoader:
         logger.info(f"Created {threads_created} threads by subject")
 
         # Update messages with thread_id
-        cur.execute("""
+        cur.execute(f"""
             UPDATE messages m
             SET thread_id = t.id
             FROM threads t
-            WHERE normalize_subject(m.subject) = t.subject_normalized
+            WHERE {subject_normalized} = t.subject_normalized
         """)
 
         messages_updated = cur.rowcount
         logger.info(f"Updated {messages_updated} messages with thread_id")
 
         # Update thread stats
+        # The root (earliest message) of every thread is found in one sorted
+        # pass rather than a correlated subquery per thread
         cur.execute("""
+            WITH roots AS (
+                SELECT DISTINCT ON (thread_id)
+                    thread_id,
+                    id as root_msg_id
+                FROM messages
+                WHERE thread_id IS NOT NULL
+                ORDER BY thread_id, date, id
+            ),
+            stats AS (
+                SELECT
+                    thread_id,
+                    COUNT(*) as msg_count,
+                    COUNT(DISTINCT from_person_id) as participant_count,
+                    MIN(date) as start_date,
+                    MAX(date) as end_date
+                FROM messages
+                WHERE thread_id IS NOT NULL
+                GROUP BY thread_id
+            )
             UPDATE threads t
             SET
-                message_count = subq.msg_count,
-                participant_count = subq.participant_count,
-                start_date = subq.start_date,
-                end_date = subq.end_date,
-                root_message_id = subq.root_msg_id
-            FROM (
-                SELECT
-                    m.thread_id,
-                    COUNT(DISTINCT m.id) as msg_count,
-                    COUNT(DISTINCT m.from_person_id) as participant_count,
-                    MIN(m.date) as start_date,
-                    MAX(m.date) as end_date,
-                    (SELECT id FROM messages WHERE thread_id = m.thread_id ORDER BY date LIMIT 1) as root_msg_id
-                FROM messages m
-                WHERE m.thread_id IS NOT NULL
-                GROUP BY m.thread_id
-            ) subq
-            WHERE t.id = subq.thread_id
+                message_count = s.msg_count,
+                participant_count = s.participant_count,
+                start_date = s.start_date,
+                end_date = s.end_date,
+                root_message_id = r.root_msg_id
+            FROM stats s
+            JOIN roots r USING (thread_id)
+            WHERE t.id = s.thread_id
         """)
 
         cur.close()
@@ -434,38 +750,35 @@ class PostgresLoader:
 
         cur = self.conn.cursor()
 
-        # Update sent counts and dates
+        # Sent and received counts in one pass, so each row is rewritten once;
+        # people missing from one side keep their current values for it
         cur.execute("""
-            UPDATE people p
-            SET
-                sent_count = subq.sent_count,
-                first_seen_at = subq.first_sent,
-                last_seen_at = subq.last_sent
-            FROM (
+            WITH sent AS (
                 SELECT
-                    from_person_id,
+                    from_person_id as person_id,
                     COUNT(*) as sent_count,
                     MIN(date) as first_sent,
                     MAX(date) as last_sent
                 FROM messages
                 WHERE from_person_id IS NOT NULL
                 GROUP BY from_person_id
-            ) subq
-            WHERE p.id = subq.from_person_id
-        """)
-
-        # Update received counts
-        cur.execute("""
-            UPDATE people p
-            SET received_count = subq.received_count
-            FROM (
+            ),
+            received AS (
                 SELECT
                     person_id,
                     COUNT(*) as received_count
                 FROM message_recipients
                 GROUP BY person_id
-            ) subq
-            WHERE p.id = subq.person_id
+            )
+            UPDATE people p
+            SET
+                sent_count = COALESCE(s.sent_count, p.sent_count),
+                first_seen_at = CASE WHEN s.person_id IS NULL THEN p.first_seen_at ELSE s.first_sent END,
+                last_seen_at = CASE WHEN s.person_id IS NULL THEN p.last_seen_at ELSE s.last_sent END,
+                received_count = COALESCE(r.received_count, p.received_count)
+            FROM sent s
+            FULL OUTER JOIN received r USING (person_id)
+            WHERE p.id = COALESCE(s.person_id, r.person_id)
         """)
 
         cur.close()
@@ -478,6 +791,10 @@ class PostgresLoader:
         logger.info("=" * 60)
         logger.info("Loading Statistics:")
         logger.info(f"  Batches processed: {self.stats['batches']}")
+        if self.failed_batches:
+            logger.error(f"  Batches failed: {len(self.failed_batches)}")
+            for batch_file in self.failed_batches:
+                logger.error(f"    {batch_file}")
         logger.info(f"  People created: {self.stats['people']:,}")
         logger.info(f"  Messages loaded: {self.stats['messages']:,}")
         logger.info(f"  Recipients: {self.stats['recipients']:,}")
@@ -492,30 +809,21 @@ class PostgresLoader:
         # Query database for summary
         cur = self.conn.cursor()
 
-        cur.execute("SELECT COUNT(*) FROM people")
-        total_people = cur.fetchone()[0]
-
-        cur.execute("SELECT COUNT(*) FROM messages")
-        total_messages = cur.fetchone()[0]
-
-        cur.execute("SELECT COUNT(*) FROM threads")
-        total_threads = cur.fetchone()[0]
-
-        cur.execute("SELECT MIN(date), MAX(date) FROM messages WHERE date IS NOT NULL")
-        date_range = cur.fetchone()
-
-        # Check if attachments table exists and get stats
-        try:
-            cur.execute("SELECT COUNT(*) FROM attachments")
-            total_attachments = cur.fetchone()[0]
-            cur.execute("SELECT COUNT(*) FROM message_attachments")
-            total_attachment_refs = cur.fetchone()[0]
-            cur.execute("SELECT COALESCE(SUM(file_size), 0) FROM attachments")
-            total_size = cur.fetchone()[0]
-        except:
-            total_attachments = 0
-            total_attachment_refs = 0
-            total_size = 0
+        # One round trip for the whole summary. The attachments tables are
+        # always there: load_batch writes to them
+        cur.execute("""
+            SELECT
+                (SELECT COUNT(*) FROM people),
+                (SELECT COUNT(*) FROM messages),
+                (SELECT COUNT(*) FROM threads),
+                (SELECT COUNT(*) FROM attachments),
+                (SELECT COUNT(*) FROM message_attachments),
+                (SELECT COALESCE(SUM(file_size), 0) FROM attachments),
+                (SELECT MIN(date) FROM messages),
+                (SELECT MAX(date) FROM messages)
+        """)
+        (total_people, total_messages, total_threads, total_attachments,
+         total_attachment_refs, total_size, *date_range) = cur.fetchone()
 
         cur.close()
 
@@ -532,6 +840,38 @@ class PostgresLoader:
         logger.info("=" * 60)
 
 
+_worker_loader: Optional[PostgresLoader] = None
+
+
+def _init_worker(db_name: str, db_user: str, db_host: str, db_port: int, db_password: Optional[str]):
+    """Create the per-process loader and connection for loading workers."""
+    global _worker_loader
+    _worker_loader = PostgresLoader(
+        db_name=db_name,
+        db_user=db_user,
+        db_host=db_host,
+        db_port=db_port,
+        db_password=db_password
+    )
+    _worker_loader.connect()
+    # Pool workers exit without running atexit handlers; this still runs
+    multiprocessing.util.Finalize(None, _worker_loader.close, exitpriority=10)
+
+
+def _load_batch_file(batch_file: Path) -> Tuple[Dict[str, int], Optional[str]]:
+    """
+    Load one batch file in a worker; returns the batch's stats and, if it
+    failed to load, the error (as text, so it always pickles).
+    """
+    loader = _worker_loader
+    loader.stats = dict.fromkeys(loader.stats, 0)
+    try:
+        loader.load_batch(batch_file)
+    except Exception as e:
+        return loader.stats, str(e)
+    return loader.stats, None
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(description='Load Enron emails into PostgreSQL')
@@ -557,6 +897,17 @@ def main():
         default='extracted_data',
         help='Directory containing extracted JSON files'
     )
+    parser.add_argument(
+        '-j', '--workers',
+        type=int,
+        default=1,
+        help='Number of loader processes, each with its own connection (default: 1)'
+    )
+    parser.add_argument(
+        '--bulk',
+        action='store_true',
+        help='Drop secondary indexes during the load and rebuild them afterwards'
+    )
     parser.add_argument(
         '--skip-threads',
         action='store_true',
@@ -574,7 +925,10 @@ def main():
 
     try:
         loader.connect()
-        loader.load_all_batches(args.data_dir)
+        if args.bulk:
+            loader.prepare_bulk_load()
+        loader.load_all_batches(args.data_dir, workers=args.workers)
+        loader.finalize_bulk_load()
 
         if not args.skip_threads:
             loader.build_threads()
@@ -588,8 +942,15 @@ def main():
         logger.error(f"Fatal error: {e}")
         raise
     finally:
+        # Never leave the database without its indexes after an aborted bulk load
+        if loader.dropped_indexes:
+            loader.conn.rollback()
+            loader.finalize_bulk_load()
         loader.close()
 
+    if loader.failed_batches:
+        sys.exit(1)
+
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,15 @@
+-- Migration: Stored normalized subject
+-- Date: 2026-10-15
+-- Description: Stores normalize_subject(subject) (see schema.sql) once per
+-- message. build_threads groups and joins on it, and load_edrm_attachments.py
+-- matches EDRM emails on it (its normalize_subject() mirrors the SQL one),
+-- so neither has to re-run the PL/pgSQL function over the whole table
+
+ALTER TABLE messages ADD COLUMN IF NOT EXISTS subject_normalized TEXT
+GENERATED ALWAYS AS (normalize_subject(subject)) STORED;
+
+-- Optimizes: sender + normalized subject lookups within a date window
+CREATE INDEX IF NOT EXISTS idx_messages_from_subject_normalized_date
+ON messages(from_person_id, subject_normalized, date);
+
+ANALYZE messages;
@@ -11,8 +11,11 @@ This script:
 import argparse
 import json
 import os
+import shutil
 import subprocess
 import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
@@ -27,13 +30,20 @@ def get_processed_files(output_dir: Path) -> set:
 
 
 def save_processed_files(output_dir: Path, processed: set):
-    """Save set of processed ZIP files."""
+    """Save set of processed ZIP files (atomically, so a crash keeps the old list)."""
     processed_file = output_dir / "processed_zips.json"
-    with open(processed_file, "w") as f:
-        json.dump(list(processed), f, indent=2)
-
-
-def run_extraction(zip_files: list, output_dir: str, verbose: bool = False) -> bool:
+    fd, tmp_path = tempfile.mkstemp(dir=output_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(sorted(processed), f, indent=2)
+        os.replace(tmp_path, processed_file)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def run_extraction(zip_files: list, output_dir: str, attachments_dir: str,
+                   verbose: bool = False) -> bool:
     """Run the extraction script on ZIP files."""
     if not zip_files:
         return True
@@ -43,6 +53,7 @@ def run_extraction(zip_files: list, output_dir: str, verbose: bool = False) -> b
         "extract_edrm_attachments.py",
         *zip_files,
         "-o", output_dir,
+        "--attachments-dir", attachments_dir,
     ]
     if verbose:
         cmd.append("-v")
@@ -128,35 +139,56 @@ def main():
         print("All files already processed. Use --force to reprocess.")
         return
 
-    # Process in batches
-    total_batches = (len(to_process) + args.batch_size - 1) // args.batch_size
+    # Process in batches. Extraction (ZIP reading) and loading (database)
+    # are pipelined: the next batch is extracted in the background while
+    # the current one loads. Each batch writes its result files to its own
+    # directory, removed once loaded; the attachment store is shared, so
+    # attachments already extracted by an earlier batch are not stored again.
+    batches = [
+        to_process[start:start + args.batch_size]
+        for start in range(0, len(to_process), args.batch_size)
+    ]
+    total_batches = len(batches)
+
+    def batch_dir(batch_num: int) -> Path:
+        return output_dir / f"batch_{batch_num + 1:04d}"
+
+    def extract(batch_num: int) -> bool:
+        return run_extraction(
+            [str(f) for f in batches[batch_num]], str(batch_dir(batch_num)),
+            str(output_dir / "attachments"), args.verbose
+        )
+
+    with ThreadPoolExecutor(max_workers=1) as extractor:
+        next_extraction = extractor.submit(extract, 0)
+
+        for batch_num, batch in enumerate(batches):
+            extracted = next_extraction.result()
+            if batch_num + 1 < total_batches:
+                next_extraction = extractor.submit(extract, batch_num + 1)
 
-    for batch_num in range(total_batches):
-        start_idx = batch_num * args.batch_size
-        end_idx = min(start_idx + args.batch_size, len(to_process))
-        batch = to_process[start_idx:end_idx]
+            print(f"\n{'='*60}")
+            print(f"Batch {batch_num + 1}/{total_batches}")
+            print(f"Processing {len(batch)} files: {batch[0].name} to {batch[-1].name}")
+            print(f"{'='*60}")
 
-        print(f"\n{'='*60}")
-        print(f"Batch {batch_num + 1}/{total_batches}")
-        print(f"Processing {len(batch)} files: {batch[0].name} to {batch[-1].name}")
-        print(f"{'='*60}")
+            if not extracted:
+                print(f"Extraction failed for batch {batch_num + 1}")
+                continue
 
-        # Extract
-        if run_extraction([str(f) for f in batch], args.output_dir, args.verbose):
             # Load
-            emails_json = str(output_dir / "edrm_emails.json")
-            attachments_json = str(output_dir / "edrm_attachments.json")
+            batch_output = batch_dir(batch_num)
+            emails_json = str(batch_output / "edrm_emails.jsonl")
+            attachments_json = str(batch_output / "edrm_attachments.jsonl")
 
             if run_loading(emails_json, attachments_json, args.verbose):
                 # Mark as processed
-                for f in batch:
-                    processed.add(f.name)
+                processed.update(f.name for f in batch)
                 save_processed_files(output_dir, processed)
+                shutil.rmtree(batch_output)
                 print(f"\nBatch {batch_num + 1} complete. Total processed: {len(processed)}")
             else:
                 print(f"Loading failed for batch {batch_num + 1}")
-        else:
-            print(f"Extraction failed for batch {batch_num + 1}")
 
     print(f"\n{'='*60}")
     print("Processing complete!")
@@ -3,7 +3,7 @@
 Re-extract emails that failed during the initial extraction.
 
 This script:
-1. Scans extraction logs or examines the tarball to find emails with Header object errors
+1. Reads the extraction log (--from-log), or examines the tarball, to find emails with Header object errors
 2. Re-extracts only those specific emails using the fixed parser
 3. Appends them to a new batch file
 """
@@ -11,8 +11,24 @@ This script:
 import tarfile
 import json
 import logging
+import mmap
+import os
+import queue
+import random
+import re
+import threading
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
-from extract_emails import EmailParser
+from typing import Any, Container, Deque, Dict, Generator, Iterator, List, Optional, Tuple
+from extract_emails import PARSE_CHUNK_SIZE, EmailParser, _init_worker, _parse_chunk, open_tarball_stream
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - fall back to the stdlib encoder
+    orjson = None
 
 logging.basicConfig(
     level=logging.INFO,
@@ -20,6 +36,184 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Emails read ahead of the parser when parsing in this process
+PREFETCH_DEPTH = 256
+
+# End of a message's header block (its first empty line)
+_HEADER_END_RE = re.compile(rb'\r?\n\r?\n')
+
+# extract_emails.py's log line for an email it could not parse
+_PARSE_ERROR_RE = re.compile(r' - ERROR - Error parsing (.+?): ')
+
+# Headers the extractor reads, lowercased; a Header object in any of them
+# made the original extraction fail
+_HEADERS_TO_CHECK = frozenset((
+    'message-id', 'from', 'to', 'cc', 'bcc', 'in-reply-to', 'references', 'subject',
+    'x-from', 'x-to', 'x-cc', 'x-bcc', 'x-folder', 'x-origin', 'x-filename',
+))
+
+# First line that is neither a header field nor a continuation line; the
+# parser takes everything from there on as body
+_NOT_A_HEADER_RE = re.compile(rb'^(?!From |[\x21-\x39\x3b-\x7e]*:|[ \t])', re.MULTILINE)
+
+# One of those header fields, with its continuation lines
+_CHECKED_FIELD_RE = re.compile(
+    rb'^(' + b'|'.join(re.escape(h.encode()) for h in sorted(_HEADERS_TO_CHECK)) + rb'):'
+    rb'(.*(?:\r?\n[ \t].*)*)',
+    re.IGNORECASE | re.MULTILINE,
+)
+
+# compat32 returns a Header object for a value holding raw 8-bit bytes
+_EIGHT_BIT_RE = re.compile(rb'[\x80-\xff]')
+
+
+@contextmanager
+def _open_tarball(tarball_path: str) -> Iterator[Tuple[tarfile.TarFile, Optional[mmap.mmap]]]:
+    """
+    Open a tarball for one front-to-back pass.
+
+    A gzipped tarball can only be read as a stream; it is inflated the
+    way extract_emails.py does it (ISA-L or pigz when available). An
+    uncompressed .tar is opened seekable instead, so members that are not
+    wanted are skipped by seeking past their data rather than reading it,
+    and is also memory-mapped so member data can be sliced straight out of
+    the page cache. Yields (tar, mmap or None).
+    """
+    with open(tarball_path, 'rb') as f:
+        gzipped = f.read(2) == b'\x1f\x8b'
+    if gzipped:
+        with open_tarball_stream(Path(tarball_path)) as tar:
+            yield tar, None
+    else:
+        with open(tarball_path, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                tarfile.open(fileobj=f, mode='r:') as tar:
+            yield tar, mm
+
+
+def _iter_emails(tarball_path: str, wanted: Optional[Container[str]] = None,
+                 headers_only: bool = False, sample_size: Optional[int] = None) -> Iterator[Tuple[bytes, str]]:
+    """
+    Yield (content, member name) for the email files of a tarball.
+
+    The tarball is read in a single forward pass: gzip cannot seek, so
+    every random access (getmembers(), getmember(), extractfile() out of
+    order) would decompress it again from the start.
+
+    Args:
+        tarball_path: Path to tarball
+        wanted: If set, only these member names are read, and reading
+            stops once all of them have been seen
+        headers_only: Yield only each email's header block (up to its
+            first empty line); from a mapped .tar the body is never copied
+        sample_size: If set, yield a uniform random sample of this many
+            emails once the pass is done (reservoir sampling); only the
+            emails that enter the reservoir are read
+    """
+    remaining = len(wanted) if wanted is not None else None
+    reservoir: List[Tuple[bytes, str]] = []
+    seen = 0
+
+    with _open_tarball(tarball_path) as (tar, mm):
+        for member in tar:
+            # tarfile records every TarInfo; nothing needs them later
+            tar.members.clear()
+
+            if not member.isfile() or not member.name.endswith('.'):
+                continue
+            if wanted is not None:
+                if member.name not in wanted:
+                    continue
+                remaining -= 1
+            if sample_size is not None:
+                # Algorithm R: the n-th email enters with probability k/n,
+                # replacing a uniformly chosen one
+                seen += 1
+                if seen > sample_size and random.randrange(seen) >= sample_size:
+                    continue
+
+            if mm is not None and not member.issparse():
+                start = member.offset_data
+                stop = start + member.size
+                if headers_only:
+                    end = _HEADER_END_RE.search(mm, start, stop)
+                    if end:
+                        stop = end.start()
+                content = mm[start:stop]
+            else:
+                f = tar.extractfile(member)
+                if f is None:
+                    continue
+                content = f.read()
+                if headers_only:
+                    end = _HEADER_END_RE.search(content)
+                    if end:
+                        content = content[:end.start()]
+
+            if sample_size is None:
+                yield content, member.name
+            elif len(reservoir) < sample_size:
+                reservoir.append((content, member.name))
+            else:
+                reservoir[random.randrange(sample_size)] = (content, member.name)
+
+            if remaining == 0:
+                break
+
+    yield from reservoir
+
+
+def _prefetch(items: Generator, depth: int = PREFETCH_DEPTH) -> Iterator:
+    """
+    Run a generator on a background thread, at most depth items ahead.
+
+    Reading the tarball (inflating it, walking the tar headers, reading
+    members) then overlaps with parsing in the calling thread, while the
+    bounded queue keeps memory in check. Errors are re-raised here.
+    """
+    items_queue: queue.Queue = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    end = object()
+    error: List[BaseException] = []
+
+    def produce():
+        try:
+            for item in items:
+                items_queue.put(item)
+                if stop.is_set():
+                    break
+        except BaseException as e:
+            error.append(e)
+        finally:
+            items.close()
+            items_queue.put(end)
+
+    reader = threading.Thread(target=produce, name='tarball-reader', daemon=True)
+    reader.start()
+    try:
+        while True:
+            item = items_queue.get()
+            if item is end:
+                break
+            yield item
+        if error:
+            raise error[0]
+    finally:
+        # Unblock and wait for the reader if we stopped early
+        stop.set()
+        while reader.is_alive():
+            try:
+                items_queue.get(timeout=0.1)
+            except queue.Empty:
+                pass
+
+
+def _json_line(record: Dict[str, Any]) -> bytes:
+    """Encode a parsed email as a single JSON line."""
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(record).encode('utf-8') + b'\n'
+
 
 def find_header_object_emails(tarball_path: str, sample_size: int = None):
     """
@@ -32,93 +226,155 @@ def find_header_object_emails(tarball_path: str, sample_size: int = None):
     Returns:
         List of file paths that have Header objects
     """
-    from email.header import Header
-    import email
-
     logger.info("Scanning tarball for emails with Header objects...")
     problem_files = []
 
-    with tarfile.open(tarball_path, 'r:gz') as tar:
-        members = [m for m in tar.getmembers() if m.isfile() and m.name.endswith('.')]
+    # Only the headers are checked
+    emails = _prefetch(_iter_emails(tarball_path, headers_only=True, sample_size=sample_size or None))
+
+    for idx, (header_block, name) in enumerate(emails, 1):
+        if idx % 10000 == 0:
+            logger.info(f"Scanned {idx:,} emails, found {len(problem_files)} with Header objects")
+
+        try:
+            # The parser takes everything after a line that is not a header as body
+            end = _NOT_A_HEADER_RE.search(header_block)
+            if end:
+                header_block = header_block[:end.start()]
+
+            # compat32 only returns Header objects for raw non-ASCII bytes
+            # (encoded words stay str), so all-ASCII headers need no check
+            if header_block.isascii():
+                continue
+
+            # Look for 8-bit bytes in any field we access, without parsing
+            # the message; like msg.get(), only the first occurrence of
+            # each header counts
+            checked = set()
+            for field in _CHECKED_FIELD_RE.finditer(header_block):
+                header = field.group(1).lower()
+                if header in checked:
+                    continue
+                checked.add(header)
+                if _EIGHT_BIT_RE.search(field.group(2)):
+                    problem_files.append(name)
+                    break
 
-        if sample_size:
-            import random
-            members = random.sample(members, min(sample_size, len(members)))
+        except Exception as e:
+            logger.debug(f"Error checking {name}: {e}")
 
-        for idx, member in enumerate(members, 1):
-            if idx % 10000 == 0:
-                logger.info(f"Scanned {idx:,} / {len(members):,} emails, found {len(problem_files)} with Header objects")
+    logger.info(f"Found {len(problem_files)} emails with Header objects")
+    return problem_files
 
-            try:
-                f = tar.extractfile(member)
-                if f is None:
-                    continue
 
-                content = f.read()
-                msg = email.message_from_bytes(content)
+def find_failed_from_log(log_path: str) -> List[str]:
+    """
+    Read the file paths that failed to parse from an extraction log.
 
-                # Check for Header objects in any field we access
-                headers_to_check = ['Message-ID', 'From', 'To', 'Cc', 'Bcc',
-                                  'In-Reply-To', 'References', 'Subject',
-                                  'X-From', 'X-To', 'X-cc', 'X-bcc',
-                                  'X-Folder', 'X-Origin', 'X-FileName']
+    Much faster than scanning the tarball: the extraction already found
+    them, and only its "Error parsing <path>: ..." lines are read.
 
-                for header in headers_to_check:
-                    val = msg.get(header)
-                    if isinstance(val, Header):
-                        problem_files.append(member.name)
-                        break
+    Args:
+        log_path: Log output of extract_emails.py
 
-            except Exception as e:
-                logger.debug(f"Error checking {member.name}: {e}")
+    Returns:
+        List of file paths, in log order, without duplicates
+    """
+    failed = {}
+    with open(log_path, encoding='utf-8', errors='replace') as f:
+        for line in f:
+            match = _PARSE_ERROR_RE.search(line)
+            if match:
+                failed[match.group(1)] = None
+
+    logger.info(f"Found {len(failed)} failed emails in {log_path}")
+    return list(failed)
 
-    logger.info(f"Found {len(problem_files)} emails with Header objects")
-    return problem_files
 
+def _parse_parallel(emails: Iterator[Tuple[bytes, str]], parser: EmailParser,
+                    workers: int) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+    """
+    Parse emails on a process pool while this process keeps reading the tarball.
 
-def reprocess_emails(tarball_path: str, file_list: list, output_file: str):
+    Uses the extractor's workers: emails go out in chunks of PARSE_CHUNK_SIZE,
+    at most 4 chunks per worker in flight. (name, result) pairs are yielded
+    in tarball order and the workers' statistics are added to parser.stats.
+    """
+    pending: Deque[Tuple[List[str], Future]] = deque()
+
+    def results(names: List[str], future: Future) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+        chunk_results, stats = future.result()
+        for key, value in stats.items():
+            parser.stats[key] += value
+        return zip(names, chunk_results)
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(None, parser.max_attachment_size),
+    ) as pool:
+        while True:
+            chunk = list(islice(emails, PARSE_CHUNK_SIZE))
+            if not chunk:
+                break
+            if len(pending) >= workers * 4:
+                yield from results(*pending.popleft())
+            pending.append(([name for _, name in chunk], pool.submit(_parse_chunk, chunk)))
+
+        while pending:
+            yield from results(*pending.popleft())
+
+
+def reprocess_emails(tarball_path: str, file_list: list, output_file: str, workers: int = 1) -> int:
     """
     Re-extract specific emails using the fixed parser.
 
+    Emails are written as they are parsed, one JSON object per line, in
+    tarball order.
+
     Args:
         tarball_path: Path to tarball
         file_list: List of file paths to re-extract
-        output_file: Output JSON file for re-extracted emails
+        output_file: Output JSONL file for re-extracted emails
+        workers: Number of parser processes (1 parses in this process)
+
+    Returns:
+        Number of emails written
     """
     logger.info(f"Re-extracting {len(file_list)} emails...")
 
     parser = EmailParser()
-    results = []
-
-    with tarfile.open(tarball_path, 'r:gz') as tar:
-        for idx, file_path in enumerate(file_list, 1):
-            if idx % 100 == 0:
-                logger.info(f"Re-extracted {idx:,} / {len(file_list):,} emails")
-
-            try:
-                member = tar.getmember(file_path)
-                f = tar.extractfile(member)
-                if f is None:
-                    continue
-
-                content = f.read()
-                parsed = parser.parse_email_file(content, file_path)
+    # The tarball is read once, front to back, picking out the wanted files
+    wanted = set(file_list)
+    seen = set()
+    written = 0
+
+    emails = _iter_emails(tarball_path, wanted)
+    if workers > 1:
+        # The pool's workers already parse while this process reads
+        parsed_emails = _parse_parallel(emails, parser, workers)
+    else:
+        parsed_emails = ((name, parser.parse_email_file(content, name)) for content, name in _prefetch(emails))
 
-                if parsed:
-                    results.append(parsed)
+    output_path = Path(output_file)
+    with open(output_path, 'wb') as f:
+        # parse_email_file logs and counts its own errors, returning None
+        for idx, (file_path, parsed) in enumerate(parsed_emails, 1):
+            if idx % 1000 == 0:
+                logger.info(f"Re-extracted {idx:,} / {len(wanted):,} emails")
 
-            except Exception as e:
-                logger.error(f"Error re-extracting {file_path}: {e}")
+            seen.add(file_path)
+            if parsed:
+                f.write(_json_line(parsed))
+                written += 1
 
-    # Write results
-    output_path = Path(output_file)
-    with open(output_path, 'w') as f:
-        json.dump(results, f, indent=2)
+    for file_path in wanted - seen:
+        logger.error(f"Error re-extracting {file_path}: not found in {tarball_path}")
 
-    logger.info(f"Wrote {len(results)} re-extracted emails to {output_path}")
+    logger.info(f"Wrote {written} re-extracted emails to {output_path}")
     parser.print_stats()
 
-    return results
+    return written
 
 
 def main():
@@ -128,12 +384,16 @@ def main():
     parser.add_argument(
         '--tarball',
         default='enron_mail_20150507.tar.gz',
-        help='Path to tarball'
+        help='Path to tarball (.tar.gz, or an uncompressed .tar for faster re-extraction)'
     )
     parser.add_argument(
         '--output',
-        default='extracted_data/emails_batch_reprocessed.json',
-        help='Output file for re-extracted emails'
+        default='extracted_data/emails_batch_reprocessed.jsonl',
+        help='Output JSONL file for re-extracted emails'
+    )
+    parser.add_argument(
+        '--from-log',
+        help='Re-extract the emails that failed in this extract_emails.py log'
     )
     parser.add_argument(
         '--scan',
@@ -144,10 +404,22 @@ def main():
         '--file-list',
         help='File containing list of paths to re-extract (one per line)'
     )
+    parser.add_argument(
+        '-j', '--workers',
+        type=int,
+        default=None,
+        help='Number of parser processes (default: number of CPUs)'
+    )
 
     args = parser.parse_args()
+    workers = args.workers or os.cpu_count() or 1
+
+    if args.from_log:
+        file_list = find_failed_from_log(args.from_log)
+        if file_list:
+            reprocess_emails(args.tarball, file_list, args.output, workers)
 
-    if args.scan:
+    elif args.scan:
         problem_files = find_header_object_emails(args.tarball)
         # Save the list
         with open('problem_emails.txt', 'w') as f:
@@ -156,15 +428,15 @@ def main():
 
         # Re-extract them
         if problem_files:
-            reprocess_emails(args.tarball, problem_files, args.output)
+            reprocess_emails(args.tarball, problem_files, args.output, workers)
 
     elif args.file_list:
         with open(args.file_list, 'r') as f:
             file_list = [line.strip() for line in f if line.strip()]
-        reprocess_emails(args.tarball, file_list, args.output)
+        reprocess_emails(args.tarball, file_list, args.output, workers)
 
     else:
-        logger.error("Either --scan or --file-list must be provided")
+        logger.error("One of --from-log, --scan or --file-list must be provided")
         return 1
 
 
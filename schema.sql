@@ -186,6 +186,13 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql IMMUTABLE;
 
+-- Normalized subject, stored once per message: thread building groups on it
+-- and load_edrm_attachments.py matches on it (migrations/003 adds it to
+-- databases created before it was part of the schema)
+ALTER TABLE messages ADD COLUMN subject_normalized TEXT
+GENERATED ALWAYS AS (normalize_subject(subject)) STORED;
+CREATE INDEX idx_messages_from_subject_normalized_date ON messages(from_person_id, subject_normalized, date);
+
 -- Function: Get thread depth (how many replies)
 CREATE OR REPLACE FUNCTION get_thread_depth(msg_id INTEGER)
 RETURNS INTEGER AS $$